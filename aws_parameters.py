@@ -1,17 +1,268 @@
+import os
+import json
+import logging
+import time
+import tempfile
+import threading
 import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 
-def get_regin_name():
-    ssm = boto3.client('ssm', region_name='sa-east-1') #definindo região padrão
+logger = logging.getLogger(__name__)
+
+# O .env (opcional) é carregado antes de ler a configuração abaixo
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# ===================== CONFIGURAÇÃO DOS PARÂMETROS ======================
+# Todos os parâmetros do projeto ficam sob o mesmo caminho na Parameter Store,
+# então são buscados de uma vez (get_parameters_by_path) e mantidos em cache
+# no processo e em disco, evitando uma chamada de rede por parâmetro.
+PARAMETERS_PATH = '/human/'
+# Variáveis definidas mas vazias (como no .env.example) também usam o padrão
+DEFAULT_REGION_NAME = os.getenv('AWS_REGION') or 'sa-east-1'  # definindo região padrão
+CACHE_TTL = int(os.getenv('HUMAN_PARAMETERS_CACHE_TTL') or '900')
+# O cache em disco contém segredos: fica num diretório privado do usuário, nunca no /tmp compartilhado
+CACHE_FILE = os.getenv('HUMAN_PARAMETERS_CACHE_FILE') or os.path.join(
+    os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'human', 'parameters_cache.json',
+)
+LOCAL_PARAMETERS_FILE = os.getenv('HUMAN_PARAMETERS_FILE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parameters.local.json')
+# Só as variáveis de ambiente com este prefixo viram parâmetros: HUMAN_PARAM_DB_NAME -> /human/DB_NAME
+ENV_PREFIX = os.getenv('HUMAN_PARAMETERS_ENV_PREFIX') or 'HUMAN_PARAM_'
+
+# Provedores: 'ssm' (padrão, com fallback para cache antigo/arquivo/env),
+# 'file' (somente o arquivo local), 'env' (somente variáveis de ambiente)
+# e 'local' (arquivo local + variáveis de ambiente, sem rede).
+PARAMETERS_PROVIDER = (os.getenv('HUMAN_PARAMETERS_PROVIDER') or 'ssm').lower()
+
+
+def _full_name(name):
+    if name.startswith('/'):
+        return name
+    return f"{PARAMETERS_PATH}{name}"
+
+
+def _fetch_ssm(region_name):
+    ssm = boto3.client('ssm', region_name=region_name)
+    paginator = ssm.get_paginator('get_parameters_by_path')
+    parameters = {}
+    for page in paginator.paginate(Path=PARAMETERS_PATH, Recursive=True, WithDecryption=True):
+        for parameter in page['Parameters']:
+            parameters[parameter['Name']] = parameter['Value']
+    return parameters
+
+
+def _load_ssm():
+    parameters = _fetch_ssm(DEFAULT_REGION_NAME)
+    # A região dos parâmetros também é um parâmetro; só busca de novo se ela for diferente
+    region_name = parameters.get(f"{PARAMETERS_PATH}REGION_NAME")
+    if region_name and region_name != DEFAULT_REGION_NAME:
+        parameters.update(_fetch_ssm(region_name))
+    return parameters
+
+
+def _load_env():
+    return {
+        _full_name(key[len(ENV_PREFIX):]): value
+        for key, value in os.environ.items()
+        if key.startswith(ENV_PREFIX) and len(key) > len(ENV_PREFIX) and value != ''
+    }
+
+
+def _load_file():
     try:
-        parameter = ssm.get_parameter(Name='/human/REGION_NAME', WithDecryption=True)
-        return parameter['Parameter']['Value']
-    except ssm.exceptions.ParameterNotFound:
-        return 'sa-east-1'
-    
-def get_ssm_parameter(name, default=None):
-    ssm = boto3.client('ssm', get_regin_name())
+        with open(LOCAL_PARAMETERS_FILE, 'r', encoding='utf-8') as arquivo:
+            data = json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+    return {_full_name(key): str(value) for key, value in data.items()}
+
+
+def _is_private(fd):
+    # Só confia no arquivo do próprio usuário e sem acesso de grupo/outros (0600)
+    if not hasattr(os, 'getuid'):
+        return True
+    info = os.fstat(fd)
+    return info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def _read_disk_cache(max_age):
+    try:
+        fd = os.open(CACHE_FILE, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, 'r', encoding='utf-8') as arquivo:
+            if not _is_private(arquivo.fileno()):
+                logger.warning("Cache de parâmetros %s ignorado: não pertence ao usuário ou não tem permissão 0600", CACHE_FILE)
+                return None
+            data = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    if max_age is not None and time.time() - data.get('loaded_at', 0) > max_age:
+        return None
+    return data.get('parameters')
+
+
+def _write_disk_cache(parameters):
+    # Escrita atômica e com permissão restrita, pois o cache contém segredos
+    try:
+        directory = os.path.dirname(CACHE_FILE) or '.'
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.human_parameters_')
+        with os.fdopen(fd, 'w', encoding='utf-8') as arquivo:
+            json.dump({'loaded_at': time.time(), 'parameters': parameters}, arquivo)
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, CACHE_FILE)
+    except OSError as error:
+        logger.warning("Não foi possível gravar o cache de parâmetros: %s", error)
+
+
+def _load_local():
+    parameters = _load_file()
+    parameters.update(_load_env())
+    return parameters
+
+
+def _load(allow_fallback=True):
+    if PARAMETERS_PROVIDER == 'env':
+        return _load_env()
+    if PARAMETERS_PROVIDER == 'file':
+        return _load_file()
+    if PARAMETERS_PROVIDER == 'local':
+        return _load_local()
+
+    parameters = _read_disk_cache(CACHE_TTL)
+    if parameters is not None:
+        return parameters
+    try:
+        parameters = _load_ssm()
+        _write_disk_cache(parameters)
+        return parameters
+    except (BotoCoreError, ClientError) as error:
+        if not allow_fallback:
+            raise
+        logger.warning("Parameter Store indisponível, usando fallback local: %s", error)
+
+    # Sem rede: um cache antigo ainda é melhor que nada, completado pelo arquivo/env local
+    parameters = _load_local()
+    parameters.update(_read_disk_cache(None) or {})
+    return parameters
+
+
+class ParameterCache:
+    """Cache em memória, thread-safe, dos parâmetros do processo.
+
+    Apenas a primeira leitura é síncrona. Depois que o TTL expira o valor
+    antigo continua sendo servido enquanto uma thread em segundo plano
+    recarrega os parâmetros, então handlers de requisição nunca esperam pela
+    Parameter Store. Se a recarga falhar os valores antigos são mantidos.
+    """
+
+    def __init__(self, loader, ttl):
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._values = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def get_all(self):
+        values = self._values
+        if values is None:
+            with self._lock:
+                if self._values is None:
+                    self.misses += 1
+                    self._values = self._loader(True)
+                    self._loaded_at = time.time()
+                    return self._values
+                values = self._values
+        with self._lock:
+            self.hits += 1
+        if time.time() - self._loaded_at > self.ttl:
+            self._schedule_refresh()
+        return values
+
+    def get(self, name, default=None):
+        return self.get_all().get(name, default)
+
+    def refresh(self):
+        values = self._loader(self._values is None)
+        with self._lock:
+            self._values = values
+            self._loaded_at = time.time()
+            self.refreshes += 1
+        return values
+
+    def clear(self):
+        with self._lock:
+            self._values = None
+            self._loaded_at = 0.0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'age': round(time.time() - self._loaded_at, 1) if self._values is not None else None,
+                'refreshing': self._refreshing,
+            }
+
+    def _schedule_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name='parameter-cache-refresh', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as error:
+            with self._lock:
+                self.refresh_errors += 1
+                # Adia a próxima tentativa em vez de disparar uma thread por requisição
+                self._loaded_at = time.time()
+            logger.error("Erro ao recarregar os parâmetros: %s", error)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+parameter_cache = ParameterCache(_load, CACHE_TTL)
+
+
+def load_parameters(refresh=False):
+    if refresh:
+        clear_disk_cache()
+        return parameter_cache.refresh()
+    return parameter_cache.get_all()
+
+
+def clear_disk_cache():
     try:
-        parameter = ssm.get_parameter(Name=name, WithDecryption=True)
-        return parameter['Parameter']['Value']
-    except ssm.exceptions.ParameterNotFound:
-        return default
+        os.remove(CACHE_FILE)
+    except OSError:
+        pass
+
+
+def get_parameter_cache_stats():
+    return parameter_cache.stats()
+
+
+def get_regin_name():
+    return parameter_cache.get(f"{PARAMETERS_PATH}REGION_NAME", DEFAULT_REGION_NAME)
+
+
+def get_ssm_parameter(name, default=None):
+    return parameter_cache.get(_full_name(name), default)
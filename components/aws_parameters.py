@@ -1,17 +1,13 @@
-import boto3
+# Os scripts de components/ rodam com esta pasta no sys.path e importam
+# `aws_parameters` daqui; este módulo apenas carrega o aws_parameters.py da raiz
+# do projeto no lugar dele, para haver uma única implementação (e um único cache).
+import os
+import sys
+import importlib.util
 
-def get_regin_name():
-    ssm = boto3.client('ssm', region_name='sa-east-1') #definindo região padrão
-    try:
-        parameter = ssm.get_parameter(Name='/human/REGION_NAME', WithDecryption=True)
-        return parameter['Parameter']['Value']
-    except ssm.exceptions.ParameterNotFound:
-        return 'sa-east-1'
-    
-def get_ssm_parameter(name, default=None):
-    ssm = boto3.client('ssm', get_regin_name())
-    try:
-        parameter = ssm.get_parameter(Name=name, WithDecryption=True)
-        return parameter['Parameter']['Value']
-    except ssm.exceptions.ParameterNotFound:
-        return default
+_spec = importlib.util.spec_from_file_location(
+    __name__, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'aws_parameters.py'),
+)
+_module = importlib.util.module_from_spec(_spec)
+sys.modules[__name__] = _module
+_spec.loader.exec_module(_module)
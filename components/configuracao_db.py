@@ -5,7 +5,8 @@ def configura_db():
     db_conf = {
         "host": get_ssm_parameter('/human/DB_HOST'),
         "user": get_ssm_parameter('/human/DB_USER'),
-        "password": get_ssm_parameter('/human/DB_PASS'),
+        # Mesmo parâmetro do settings do Django; DB_PASS é o nome antigo
+        "password": get_ssm_parameter('/human/DB_PASSWORD') or get_ssm_parameter('/human/DB_PASS'),
         "database": get_ssm_parameter('/human/DB_NAME')
     }
     return db_conf
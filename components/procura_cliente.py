@@ -1,8 +1,48 @@
 from components.configuracao_db import ler_sql
+import re
+import time
 import mysql.connector
 
+# Nome/CNPJ/CPF -> id do cliente, em memória durante a execução do robô
+CACHE_TTL_CLIENTES = 300
+_cache_clientes = {}
+
+def chave_cliente(valor):
+    # Mesma regra de human_app.services.clientes_resolver: documentos só com dígitos
+    valor = str(valor or '').strip()
+    if re.fullmatch(r'[\d.\-/\s]+', valor):
+        digitos = re.sub(r'\D', '', valor)
+        if len(digitos) == 14:
+            return 'cnpj_digitos', digitos
+        if len(digitos) == 11:
+            return 'cpf_digitos', digitos
+    return 'nome_razao_social', valor
+
+def procura_cliente_id(chave, db_conf):
+    try:
+        campo, valor = chave_cliente(chave)
+        if not valor:
+            return None
+        cache = _cache_clientes.get((campo, valor))
+        if cache and cache[1] > time.monotonic():
+            return cache[0]
+        query_procura_cliente_id = ler_sql('sql/procura_cliente_id.sql').format(campo=campo)
+        with mysql.connector.connect(**db_conf) as conn, conn.cursor() as cursor:
+            cursor.execute(query_procura_cliente_id, (valor,))
+            cliente = cursor.fetchone()
+        if cliente:
+            _cache_clientes[(campo, valor)] = (cliente[0], time.monotonic() + CACHE_TTL_CLIENTES)
+            return cliente[0]
+        return None
+    except Exception as error:
+        print(error)
+
 def procura_cliente(nome_cliente, db_conf):
     try:
+        if chave_cliente(nome_cliente)[0] != 'nome_razao_social':
+            # CNPJ/CPF: resolve pelo índice de documentos normalizados
+            cliente_id = procura_cliente_id(nome_cliente, db_conf)
+            return procura_cliente_por_id(cliente_id, db_conf) if cliente_id else None
         query_procura_cliente = ler_sql('sql/procura_cliente.sql')
         values_procura_cliente = (nome_cliente,)
         with mysql.connector.connect(**db_conf) as conn, conn.cursor() as cursor:
@@ -3,4 +3,9 @@ from django.apps import AppConfig
 
 class HumanAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'human_app'
\ No newline at end of file
+    name = 'human_app'
+
+    def ready(self):
+        from . import signals
+        from .services.password_reset import start_purge_scheduler
+        start_purge_scheduler()
@@ -1,6 +1,10 @@
+import copy
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import exceptions
+from human_app.services.user_cache import get_cached_user, cache_user
+from human_app.services.token_revocation import is_token_revoked
 
 class JWTAuthenticationFromCookie(JWTAuthentication):
     def authenticate(self, request):   
@@ -8,10 +12,21 @@ class JWTAuthenticationFromCookie(JWTAuthentication):
         if access_token:
             try:
                 validated_token = self.get_validated_token(access_token)
+                if is_token_revoked(validated_token):
+                    raise exceptions.AuthenticationFailed('Token revogado')
                 user = self.get_user(validated_token)
                 return (user, validated_token)
             except (InvalidToken, TokenError) as e:
                 raise exceptions.AuthenticationFailed('Token inválido')
         elif not access_token:
             return None
-            
\ No newline at end of file
+
+    def get_user(self, validated_token):
+        # Evita a consulta em auth_user a cada requisição; o cache é invalidado pelos signals
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = get_cached_user(user_id) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user_id, user)
+        # Cada requisição recebe sua própria cópia para não compartilhar estado entre threads
+        return copy.copy(user)
@@ -0,0 +1,24 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from human_app.services.importacao_funcionarios import ler_arquivo, importar_funcionarios
+
+
+class Command(BaseCommand):
+    help = 'Cadastra em lote os funcionários de um arquivo CSV ou JSON (username, email, password, first_name, last_name, rg, cpf, telefone_celular).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo CSV ou JSON.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['arquivo'], 'rb') as arquivo:
+                linhas = ler_arquivo(arquivo.read(), options['arquivo'])
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error) as error:
+            raise CommandError(f"Não foi possível ler o arquivo: {error}")
+
+        results = importar_funcionarios(linhas)
+        criados = sum(1 for result in results if result['status'] == 'success')
+        for result in results:
+            if result['status'] != 'success':
+                self.stderr.write(f"Linha {result['linha']} ({result['username']}): {result['error']}")
+        self.stdout.write(self.style.SUCCESS(f"{criados} de {len(results)} funcionários cadastrados."))
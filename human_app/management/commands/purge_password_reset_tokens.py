@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from human_app.services.password_reset import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Remove em lotes os tokens de redefinição de senha expirados (tabela password_reset).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas apagadas por lote.')
+        parser.add_argument('--max-batches', type=int, default=None, help='Número máximo de lotes nesta execução.')
+        parser.add_argument('--pause', type=float, default=0, help='Pausa (s) entre os lotes.')
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(options['batch_size'], options['max_batches'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} tokens expirados removidos."))
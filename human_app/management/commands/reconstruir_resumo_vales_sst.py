@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from human_app.services.resumo_vales_sst import reconstruir_resumo_vales_sst
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o resumo mensal de vales e SST (tabela clientes_financeiro_vales_sst) a partir de clientes_financeiro_valores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ano', type=int, default=None, help='Reconstrói só o ano informado')
+
+    def handle(self, *args, **options):
+        total = reconstruir_resumo_vales_sst(ano=options['ano'])
+        self.stdout.write(self.style.SUCCESS(f"{total} linhas de resumo gravadas."))
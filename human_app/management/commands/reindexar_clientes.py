@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from human_app.services.busca_clientes import reindexar_clientes
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca dos clientes financeiros (tabela clientes_financeiro_busca).'
+
+    def handle(self, *args, **options):
+        total = reindexar_clientes()
+        self.stdout.write(self.style.SUCCESS(f"{total} clientes indexados."))
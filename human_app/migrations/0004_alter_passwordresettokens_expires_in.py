@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0003_revokedtokens'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='passwordresettokens',
+            name='expires_in',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:00
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Cópia do tokenizador de human_app.services.busca_clientes na data desta
+# migração: a migração não pode depender do código atual do serviço
+PESOS = {
+    'nome_razao_social': 3,
+    'nome_fantasia': 2,
+    'cnpj': 3,
+    'cpf': 3,
+    'email': 1,
+}
+
+TAMANHO_TERMO = 100
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(char for char in texto if not unicodedata.combining(char)).lower()
+
+
+def tokenizar(texto):
+    return re.findall(r'[a-z0-9]+', normalizar(texto))
+
+
+def termos_cliente(cliente):
+    termos = {}
+    for campo in ('nome_razao_social', 'nome_fantasia'):
+        for termo in tokenizar(getattr(cliente, campo)):
+            termos[(termo[:TAMANHO_TERMO], campo)] = PESOS[campo]
+    for campo in ('cnpj', 'cpf'):
+        digitos = re.sub(r'\D', '', getattr(cliente, campo) or '')
+        if digitos:
+            termos[(digitos, campo)] = PESOS[campo]
+    if cliente.email:
+        email = normalizar(cliente.email).strip()
+        termos[(email[:TAMANHO_TERMO], 'email')] = PESOS['email']
+        for termo in tokenizar(email):
+            termos.setdefault((termo[:TAMANHO_TERMO], 'email'), PESOS['email'])
+    return termos
+
+
+def indexar_clientes(apps, schema_editor):
+    ClientesFinanceiro = apps.get_model('human_app', 'ClientesFinanceiro')
+    ClientesFinanceiroBusca = apps.get_model('human_app', 'ClientesFinanceiroBusca')
+    termos = []
+    for cliente in ClientesFinanceiro.objects.all().iterator():
+        termos.extend(
+            ClientesFinanceiroBusca(cliente_id=cliente.pk, termo=termo, campo=campo, peso=peso)
+            for (termo, campo), peso in termos_cliente(cliente).items()
+        )
+    ClientesFinanceiroBusca.objects.bulk_create(termos, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0004_alter_passwordresettokens_expires_in'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientesFinanceiroBusca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('termo', models.CharField(max_length=100)),
+                ('campo', models.CharField(max_length=20)),
+                ('peso', models.IntegerField(default=1)),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='termos_busca', to='human_app.clientesfinanceiro')),
+            ],
+            options={
+                'db_table': 'clientes_financeiro_busca',
+                'indexes': [models.Index(fields=['termo', 'cliente'], name='clientes_busca_termo_idx')],
+            },
+        ),
+        migrations.RunPython(indexar_clientes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0005_clientesfinanceirobusca'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientesfinanceiro',
+            index=models.Index(fields=['nome_razao_social', 'id'], name='clientes_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientesfinanceirovalores',
+            index=models.Index(fields=['ano', 'mes', 'id'], name='clientes_valores_periodo_idx'),
+        ),
+    ]
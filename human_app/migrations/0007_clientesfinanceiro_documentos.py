@@ -0,0 +1,56 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:00
+
+import re
+import logging
+from django.db import migrations, models
+
+logger = logging.getLogger('human_app')
+
+
+def normalizar_documentos(apps, schema_editor):
+    ClientesFinanceiro = apps.get_model('human_app', 'ClientesFinanceiro')
+    usados = {'cnpj_digitos': set(), 'cpf_digitos': set()}
+    clientes = []
+    for cliente in ClientesFinanceiro.objects.order_by('id').iterator():
+        for origem, campo in (('cnpj', 'cnpj_digitos'), ('cpf', 'cpf_digitos')):
+            digitos = re.sub(r'\D', '', getattr(cliente, origem) or '') or None
+            if digitos in usados[campo]:
+                # Documento repetido: a chave fica com o cliente mais antigo
+                logger.warning("Cliente %s: %s %s já pertence a outro cliente, chave não preenchida", cliente.id, origem, digitos)
+                digitos = None
+            if digitos:
+                usados[campo].add(digitos)
+            setattr(cliente, campo, digitos)
+        clientes.append(cliente)
+    ClientesFinanceiro.objects.bulk_update(clientes, ['cnpj_digitos', 'cpf_digitos'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0006_clientes_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientesfinanceiro',
+            name='cnpj_digitos',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientesfinanceiro',
+            name='cpf_digitos',
+            field=models.CharField(blank=True, editable=False, max_length=11, null=True),
+        ),
+        migrations.RunPython(normalizar_documentos, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='clientesfinanceiro',
+            name='cnpj_digitos',
+            field=models.CharField(blank=True, editable=False, max_length=14, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='clientesfinanceiro',
+            name='cpf_digitos',
+            field=models.CharField(blank=True, editable=False, max_length=11, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:00
+
+import logging
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger('human_app')
+
+# Campos somados ao mesclar linhas duplicadas de um mesmo (cliente, ano, mes), o mesmo
+# que sql/soma_valores_multiplos.sql fazia a cada consulta dos robôs
+CAMPOS_SOMA = [
+    'convenio_farmacia', 'adiant_salarial', 'numero_empregados', 'numero_estagiarios',
+    'trabalhando', 'salario_contri_empregados', 'salario_contri_contribuintes',
+    'soma_salarios_provdt', 'inss', 'fgts', 'irrf', 'salarios_pagar', 'vale_transporte',
+    'assinat_eletronica', 'vale_refeicao', 'mensal_ponto_elet', 'saude_seguranca_trabalho',
+    'economia_mensal', 'economia_liquida', 'total_fatura',
+]
+# Percentual e indicadores de envio não se somam: vale o maior
+CAMPOS_MAX = ['percentual_human', 'anexo_enviado', 'relatorio_enviado']
+
+
+def mesclar_linhas(linhas):
+    # Mantém a linha mais antiga com a soma/máximo das demais; retorna (mantida, removidas)
+    linhas = sorted(linhas, key=lambda linha: linha.id)
+    mantida, removidas = linhas[0], linhas[1:]
+    for campo in CAMPOS_SOMA:
+        valores = [getattr(linha, campo) for linha in linhas if getattr(linha, campo) is not None]
+        setattr(mantida, campo, sum(valores) if valores else None)
+    for campo in CAMPOS_MAX:
+        valores = [getattr(linha, campo) for linha in linhas if getattr(linha, campo) is not None]
+        setattr(mantida, campo, max(valores) if valores else None)
+    if mantida.cod_empresa is None:
+        mantida.cod_empresa = next((linha.cod_empresa for linha in removidas if linha.cod_empresa is not None), None)
+    return mantida, removidas
+
+
+def mesclar_duplicados(apps, schema_editor):
+    ClientesFinanceiroValores = apps.get_model('human_app', 'ClientesFinanceiroValores')
+    duplicados = (
+        ClientesFinanceiroValores.objects.values('cliente_id', 'ano', 'mes')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+    )
+    mescladas = 0
+    for chave in duplicados.iterator():
+        linhas = list(ClientesFinanceiroValores.objects.select_for_update().filter(
+            cliente_id=chave['cliente_id'], ano=chave['ano'], mes=chave['mes'],
+        ))
+        mantida, removidas = mesclar_linhas(linhas)
+        mantida.save(update_fields=CAMPOS_SOMA + CAMPOS_MAX + ['cod_empresa'])
+        ClientesFinanceiroValores.objects.filter(id__in=[linha.id for linha in removidas]).delete()
+        mescladas += len(removidas)
+    if mescladas:
+        logger.warning("%s linhas duplicadas de clientes_financeiro_valores mescladas", mescladas)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0007_clientesfinanceiro_documentos'),
+    ]
+
+    operations = [
+        migrations.RunPython(mesclar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='clientesfinanceirovalores',
+            constraint=models.UniqueConstraint(fields=('cliente', 'ano', 'mes'), name='clientes_valores_cliente_periodo_uniq'),
+        ),
+    ]
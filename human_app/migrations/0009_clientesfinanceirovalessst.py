@@ -0,0 +1,51 @@
+# Generated by Django 5.0.3 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum, Value, FloatField
+from django.db.models.functions import Coalesce
+
+CAMPOS_VALES_SST = ['vale_transporte', 'assinat_eletronica', 'vale_refeicao', 'mensal_ponto_elet', 'saude_seguranca_trabalho']
+
+
+def popular_resumo(apps, schema_editor):
+    ClientesFinanceiroValores = apps.get_model('human_app', 'ClientesFinanceiroValores')
+    ClientesFinanceiroValesSST = apps.get_model('human_app', 'ClientesFinanceiroValesSST')
+    totais = ClientesFinanceiroValores.objects.values('cliente_id', 'ano', 'mes').annotate(**{
+        campo: Coalesce(Sum(campo), Value(0.0, output_field=FloatField())) for campo in CAMPOS_VALES_SST
+    }).order_by()
+    ClientesFinanceiroValesSST.objects.bulk_create(
+        (ClientesFinanceiroValesSST(**linha) for linha in totais.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0008_clientesfinanceirovalores_cliente_periodo_uniq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientesFinanceiroValesSST',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ano', models.IntegerField()),
+                ('mes', models.IntegerField()),
+                ('vale_transporte', models.FloatField(default=0)),
+                ('assinat_eletronica', models.FloatField(default=0)),
+                ('vale_refeicao', models.FloatField(default=0)),
+                ('mensal_ponto_elet', models.FloatField(default=0)),
+                ('saude_seguranca_trabalho', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_vales_sst', to='human_app.clientesfinanceiro')),
+            ],
+            options={
+                'db_table': 'clientes_financeiro_vales_sst',
+                'indexes': [models.Index(fields=['ano', 'mes'], name='clientes_vales_sst_periodo_idx')],
+                'constraints': [models.UniqueConstraint(fields=('cliente', 'ano', 'mes'), name='clientes_vales_sst_cliente_periodo_uniq')],
+            },
+        ),
+        migrations.RunPython(popular_resumo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0009_clientesfinanceirovalessst'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientesfinanceiroreembolsos',
+            index=models.Index(fields=['ano', 'mes'], name='reembolsos_periodo_idx'),
+        ),
+    ]
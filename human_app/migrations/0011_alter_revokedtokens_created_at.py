@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0010_clientesfinanceiroreembolsos_periodo_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='revokedtokens',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
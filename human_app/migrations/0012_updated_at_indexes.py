@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('human_app', '0011_alter_revokedtokens_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clientesfinanceiro',
+            index=models.Index(fields=['updated_at'], name='clientes_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientesfinanceiro',
+            index=models.Index(fields=['is_active', 'updated_at'], name='clientes_ativo_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientesfinanceirovalores',
+            index=models.Index(fields=['updated_at'], name='clientes_valores_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientesfinanceirofolhaponto',
+            index=models.Index(fields=['updated_at'], name='folha_ponto_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='robos',
+            index=models.Index(fields=['updated_at'], name='robos_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -19,7 +19,7 @@ class PasswordResetTokens(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='password_reset', blank=False, null=False)
     token = models.CharField(max_length=255, blank=False, null=False, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_in = models.DateTimeField(null=False, blank=False)
+    expires_in = models.DateTimeField(db_index=True, null=False, blank=False)
 
     def __str__(self):
         return self.token
@@ -30,11 +30,26 @@ class PasswordResetTokens(models.Model):
     class Meta:
         db_table = 'password_reset'
 
+class RevokedTokens(models.Model):
+    jti = models.CharField(max_length=255, unique=True, blank=False, null=False)
+    token_type = models.CharField(max_length=20, blank=False, null=False)
+    expires_at = models.DateTimeField(db_index=True, null=False, blank=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+    class Meta:
+        db_table = 'revoked_tokens'
+
 class ClientesFinanceiro(models.Model):
     nome_razao_social = models.CharField(max_length=255, blank=False, null=False)
     nome_fantasia = models.CharField(max_length=255, blank=True, null=True)
     cnpj = models.CharField(max_length=25, blank=True, null=True)
     cpf = models.CharField(max_length=25, blank=True, null=True)
+    # Documentos só com dígitos, preenchidos a cada save (human_app.services.clientes_resolver)
+    cnpj_digitos = models.CharField(max_length=14, blank=True, null=True, unique=True, editable=False)
+    cpf_digitos = models.CharField(max_length=11, blank=True, null=True, unique=True, editable=False)
     email = models.CharField(max_length=255, blank=True, null=True)
     telefone_celular = models.CharField(max_length=25, blank=True, null=True)
     regiao = models.CharField(max_length=45)
@@ -44,6 +59,45 @@ class ClientesFinanceiro(models.Model):
 
     class Meta:
         db_table = 'clientes_financeiro'
+        indexes = [
+            models.Index(fields=['nome_razao_social', 'id'], name='clientes_nome_idx'),
+            # MAX(updated_at) dos validadores do conditional_get
+            models.Index(fields=['updated_at'], name='clientes_updated_idx'),
+            models.Index(fields=['is_active', 'updated_at'], name='clientes_ativo_updated_idx'),
+        ]
+
+class ClientesFinanceiroBusca(models.Model):
+    # Índice de busca: termos normalizados (sem acento, minúsculos) de cada cliente,
+    # mantido por human_app.services.busca_clientes a cada save do cliente
+    cliente = models.ForeignKey(to=ClientesFinanceiro,
+                                   on_delete=models.CASCADE,
+                                   related_name='termos_busca', blank=False, null=False)
+    termo = models.CharField(max_length=100, blank=False, null=False)
+    campo = models.CharField(max_length=20, blank=False, null=False)
+    peso = models.IntegerField(default=1)
+
+    class Meta:
+        db_table = 'clientes_financeiro_busca'
+        indexes = [
+            models.Index(fields=['termo', 'cliente'], name='clientes_busca_termo_idx'),
+        ]
+
+class ClientesFinanceiroValoresQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # QuerySet.update() não dispara signals nem auto_now: grava updated_at e
+        # recalcula o resumo de vales/SST das chaves (cliente, ano, mes) afetadas
+        from human_app.services.resumo_vales_sst import CAMPOS_VALES_SST, atualizar_resumo_vales_sst
+        kwargs.setdefault('updated_at', timezone.now())
+        if not set(kwargs) & set(CAMPOS_VALES_SST + ['cliente', 'cliente_id', 'ano', 'mes']):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            linhas = list(self.values_list('id', 'cliente_id', 'ano', 'mes'))
+            total = super().update(**kwargs)
+            chaves = {linha[1:] for linha in linhas}
+            chaves.update(self.model.objects.filter(id__in=[linha[0] for linha in linhas]).values_list('cliente_id', 'ano', 'mes'))
+            atualizar_resumo_vales_sst(chaves)
+        return total
+
 
 class ClientesFinanceiroValores(models.Model):
     cliente = models.ForeignKey(to=ClientesFinanceiro, 
@@ -78,8 +132,42 @@ class ClientesFinanceiroValores(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ClientesFinanceiroValoresQuerySet.as_manager()
+
     class Meta:
         db_table = 'clientes_financeiro_valores'
+        indexes = [
+            models.Index(fields=['ano', 'mes', 'id'], name='clientes_valores_periodo_idx'),
+            models.Index(fields=['updated_at'], name='clientes_valores_updated_idx'),
+        ]
+        constraints = [
+            # Um registro por cliente e mês; também é o índice das consultas por (cliente, ano, mes)
+            models.UniqueConstraint(fields=['cliente', 'ano', 'mes'], name='clientes_valores_cliente_periodo_uniq'),
+        ]
+
+class ClientesFinanceiroValesSST(models.Model):
+    # Resumo materializado dos vales e SST por cliente e mês, mantido a partir de
+    # ClientesFinanceiroValores por human_app.services.resumo_vales_sst
+    cliente = models.ForeignKey(to=ClientesFinanceiro,
+                                   on_delete=models.CASCADE,
+                                   related_name='resumos_vales_sst', blank=False, null=False)
+    ano = models.IntegerField()
+    mes = models.IntegerField()
+    vale_transporte = models.FloatField(default=0)
+    assinat_eletronica = models.FloatField(default=0)
+    vale_refeicao = models.FloatField(default=0)
+    mensal_ponto_elet = models.FloatField(default=0)
+    saude_seguranca_trabalho = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'clientes_financeiro_vales_sst'
+        indexes = [
+            models.Index(fields=['ano', 'mes'], name='clientes_vales_sst_periodo_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['cliente', 'ano', 'mes'], name='clientes_vales_sst_cliente_periodo_uniq'),
+        ]
 
 class ClientesFinanceiroReembolsos(models.Model):
     cliente = models.ForeignKey(to=ClientesFinanceiro, 
@@ -94,6 +182,9 @@ class ClientesFinanceiroReembolsos(models.Model):
 
     class Meta:
         db_table = 'clientes_financeiro_reembolsos'
+        indexes = [
+            models.Index(fields=['ano', 'mes'], name='reembolsos_periodo_idx'),
+        ]
 
 class ClientesFinanceiroFolhaPonto(models.Model):
     cliente = models.ForeignKey(to=ClientesFinanceiro, 
@@ -106,6 +197,9 @@ class ClientesFinanceiroFolhaPonto(models.Model):
 
     class Meta:
         db_table = 'clientes_financeiro_folha_ponto'
+        indexes = [
+            models.Index(fields=['updated_at'], name='folha_ponto_updated_idx'),
+        ]
 
 class Robos(models.Model):
     nome = models.CharField(max_length=50, unique=True, blank=False, null=False)
@@ -118,6 +212,9 @@ class Robos(models.Model):
 
     class Meta:
         db_table = 'robos'
+        indexes = [
+            models.Index(fields=['updated_at'], name='robos_updated_idx'),
+        ]
 
 class Parametros(models.Model):
     INTEGER = "INTEGER"
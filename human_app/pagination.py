@@ -0,0 +1,136 @@
+import json
+import base64
+from collections import OrderedDict
+from django.db import connection
+from django.db.models import Q
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def usar_cursor(request):
+    # Paginação por cursor é opcional: ?paginacao=cursor (ou um ?cursor= já recebido)
+    return request.query_params.get('paginacao') == 'cursor' or 'cursor' in request.query_params
+
+
+class KeysetPagination(BasePagination):
+    """Paginação por cursor (keyset) sobre uma ordenação estável e indexada.
+
+    `ordering` é uma tupla de campos (com '-' para decrescente) cujo último
+    item deve ser único, normalmente o id. Em vez de OFFSET, a próxima página
+    é buscada a partir dos valores da última linha da página atual:
+    (a > x) OR (a = x AND b > y) OR ..., então qualquer página custa o mesmo
+    que a primeira e não há COUNT(*). Com ?estimar_total=true a resposta traz
+    `estimated_table_rows`: a estimativa de linhas da tabela inteira mantida
+    pelo MySQL, que ignora os filtros da consulta. Só navega para frente.
+    Cursores inválidos geram ValidationError (400).
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    page_size = 50
+    max_page_size = 500
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.estimated_table_rows = self.get_estimated_table_rows(queryset) if request.query_params.get('estimar_total') == 'true' else None
+
+        position = self.decode_cursor(request, queryset.model)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ])
+        if self.estimated_table_rows is not None:
+            response['estimated_table_rows'] = self.estimated_table_rows
+        return Response(response)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_position_filter(self, position):
+        filtro = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condicao = Q(**{f'{name}__{lookup}': position[index]})
+            for anterior, valor in zip(self.ordering[:index], position):
+                condicao &= Q(**{anterior.lstrip('-'): valor})
+            filtro |= condicao
+        return filtro
+
+    def get_position_from_instance(self, instance):
+        position = []
+        for field in self.ordering:
+            value = instance
+            for attr in field.lstrip('-').split('__'):
+                value = value[attr] if isinstance(value, dict) else getattr(value, attr)
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.get_position_from_instance(self.page[-1])
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position))
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position, default=str).encode()).decode()
+
+    def get_ordering_field(self, model, field):
+        # Campo do model (seguindo relações 'a__b') para converter o valor vindo do cursor
+        names = field.lstrip('-').split('__')
+        for name in names[:-1]:
+            model = model._meta.get_field(name).related_model
+        return model._meta.get_field(names[-1])
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (TypeError, ValueError):
+            raise ValidationError({self.cursor_query_param: 'Cursor inválido'})
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise ValidationError({self.cursor_query_param: 'Cursor inválido'})
+        values = []
+        for field, value in zip(self.ordering, position):
+            # Só valores escalares não nulos, convertidos pelo tipo do campo da ordenação
+            if value is None or isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise ValidationError({self.cursor_query_param: 'Cursor inválido'})
+            try:
+                values.append(self.get_ordering_field(model, field).to_python(value))
+            except DjangoValidationError:
+                raise ValidationError({self.cursor_query_param: 'Cursor inválido'})
+        return values
+
+    def get_estimated_table_rows(self, queryset):
+        # Estatística da tabela inteira (information_schema), sem varrer as linhas e sem filtros
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
@@ -1,16 +1,47 @@
 from rest_framework import serializers
 from human_app.models import ClientesFinanceiro, ClientesFinanceiroValores, ClientesFinanceiroReembolsos, ClientesFinanceiroFolhaPonto
+from human_app.services.busca_clientes import somente_digitos
+from human_app.services.valores_financeiro import CAMPOS_VALORES
 
 class ClientesFinanceiroSerializer(serializers.ModelSerializer):
     class Meta:
        model = ClientesFinanceiro
-       fields = '__all__' 
+       exclude = ['cnpj_digitos', 'cpf_digitos']
+
+    def validar_documento(self, valor, campo, nome):
+        # Compara só os dígitos, pelo índice único, para '12.345.678/0001-90' e '12345678000190' colidirem
+        digitos = somente_digitos(valor)
+        if digitos:
+            clientes = ClientesFinanceiro.objects.filter(**{campo: digitos})
+            if self.instance is not None:
+                clientes = clientes.exclude(pk=self.instance.pk)
+            if clientes.exists():
+                raise serializers.ValidationError(f'Já existe um cliente com este {nome}.')
+        return valor
+
+    def validate_cnpj(self, value):
+        return self.validar_documento(value, 'cnpj_digitos', 'CNPJ')
+
+    def validate_cpf(self, value):
+        return self.validar_documento(value, 'cpf_digitos', 'CPF')
 
 class ClientesFinanceiroValoresSerializer(serializers.ModelSerializer):
     class Meta:
        model = ClientesFinanceiroValores
        fields = '__all__' 
 
+class ClientesFinanceiroValoresUpsertSerializer(serializers.ModelSerializer):
+    # Valida um mês de valores de um cliente para o upsert; a chave única
+    # (cliente, ano, mes) é resolvida pelo banco, então sem validador de unicidade
+    class Meta:
+        model = ClientesFinanceiroValores
+        fields = ['ano', 'mes'] + CAMPOS_VALORES
+        validators = []
+        extra_kwargs = {
+            'mes': {'min_value': 1, 'max_value': 12},
+            'ano': {'min_value': 2000, 'max_value': 2100},
+        }
+
 class ClientesFinanceiroValesSSTSerializer(serializers.ModelSerializer):
     vale_transporte = serializers.FloatField()
     assinat_eletronica = serializers.FloatField()
@@ -77,6 +108,27 @@ class ClientesFinanceiroReembolsosSerializer(serializers.ModelSerializer):
         representation['nome_razao_social'] = cliente_nome
         return representation
 
+REEMBOLSOS_PROJECAO_CAMPOS = (
+    'id', 'cliente_id', 'descricao', 'valor', 'mes', 'ano', 'created_at', 'updated_at',
+    'cliente__id', 'cliente__nome_razao_social',
+)
+
+def reembolsos_projecao(queryset=None):
+    if queryset is None:
+        queryset = ClientesFinanceiroReembolsos.objects.all()
+    return queryset.select_related('cliente').only(*REEMBOLSOS_PROJECAO_CAMPOS)
+
+class ClientesFinanceiroReembolsosProjecaoSerializer(serializers.ModelSerializer):
+    # Somente leitura: usar com reembolsos_projecao(). Mesmo formato do
+    # ClientesFinanceiroReembolsosSerializer, sem serializar o cliente inteiro.
+    cliente_id = serializers.IntegerField(read_only=True)
+    nome_razao_social = serializers.CharField(source='cliente.nome_razao_social', read_only=True)
+
+    class Meta:
+        model = ClientesFinanceiroReembolsos
+        fields = ['id', 'cliente_id', 'nome_razao_social', 'descricao', 'valor', 'mes', 'ano', 'created_at', 'updated_at']
+        read_only_fields = fields
+
 class ClienteFinanceiroFolhaPontoSerializer(serializers.ModelSerializer):
     cliente = ClientesFinanceiroSerializer(read_only=True)
     cliente_id = serializers.PrimaryKeyRelatedField(queryset=ClientesFinanceiro.objects.all(), write_only=True, source='cliente')
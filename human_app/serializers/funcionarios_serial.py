@@ -14,4 +14,39 @@ class FuncionariosSerializer(serializers.ModelSerializer):
         user_representation = representation.pop('user')
         for key in user_representation:
             representation[key] = user_representation[key]
-        return representation
\ No newline at end of file
+        return representation
+
+# Colunas lidas pelas telas de funcionários; senha e permissões ficam de fora
+FUNCIONARIOS_PROJECAO_CAMPOS = (
+    'id', 'user_id', 'rg', 'cpf', 'telefone_celular', 'situacao',
+    'user__id', 'user__username', 'user__first_name', 'user__last_name', 'user__email',
+    'user__is_active', 'user__is_staff', 'user__is_superuser', 'user__last_login', 'user__date_joined',
+)
+
+def funcionarios_projecao(queryset=None):
+    if queryset is None:
+        queryset = Funcionarios.objects.all()
+    return queryset.select_related('user').only(*FUNCIONARIOS_PROJECAO_CAMPOS)
+
+class FuncionariosProjecaoSerializer(serializers.ModelSerializer):
+    # Somente leitura: usar com funcionarios_projecao() para não carregar colunas extras.
+    # Os grupos são adicionados pela view (prefetch ou cache de permissões).
+    id = serializers.IntegerField(source='user.id', read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    first_name = serializers.CharField(source='user.first_name', read_only=True)
+    last_name = serializers.CharField(source='user.last_name', read_only=True)
+    email = serializers.CharField(source='user.email', read_only=True)
+    is_active = serializers.BooleanField(source='user.is_active', read_only=True)
+    is_staff = serializers.BooleanField(source='user.is_staff', read_only=True)
+    is_superuser = serializers.BooleanField(source='user.is_superuser', read_only=True)
+    last_login = serializers.DateTimeField(source='user.last_login', read_only=True)
+    date_joined = serializers.DateTimeField(source='user.date_joined', read_only=True)
+
+    class Meta:
+        model = Funcionarios
+        fields = [
+            'id', 'username', 'first_name', 'last_name', 'email',
+            'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined',
+            'rg', 'cpf', 'telefone_celular', 'situacao',
+        ]
+        read_only_fields = fields
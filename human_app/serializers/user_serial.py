@@ -1,6 +1,12 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from human_app.models import *
-from django.contrib.auth.models import User, Group
+from human_app.services.token_claims import add_profile_claims
+from human_app.services.token_revocation import is_token_revoked, revoke_tokens
+from django.contrib.auth.models import User, Group, Permission
+from django.db.models import Prefetch
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,6 +26,27 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         return user
     
+USER_PROJECAO_CAMPOS = (
+    'id', 'username', 'first_name', 'last_name', 'email',
+    'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined',
+)
+
+def user_projecao(queryset=None):
+    # Grupos e permissões em um prefetch cada, em vez de duas consultas por usuário
+    if queryset is None:
+        queryset = User.objects.all()
+    return queryset.only(*USER_PROJECAO_CAMPOS).prefetch_related(
+        Prefetch('groups', queryset=Group.objects.only('id')),
+        Prefetch('user_permissions', queryset=Permission.objects.only('id')),
+    )
+
+class UserProjecaoSerializer(serializers.ModelSerializer):
+    # Somente leitura: usar com user_projecao(); mesma saída do UserSerializer sem a senha
+    class Meta:
+        model = User
+        fields = list(USER_PROJECAO_CAMPOS) + ['groups', 'user_permissions']
+        read_only_fields = fields
+
 class GroupSerializer(serializers.ModelSerializer):
     class Meta:
        model = Group
@@ -33,4 +60,22 @@ class PasswordResetTokenSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data['expires_in'] = timezone.now() + timezone.timedelta(minutes=15)
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Grupos, situação e dados de exibição vão assinados no token
+        token = super().get_token(user)
+        return add_profile_claims(token, user)
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_token_revoked(refresh):
+            raise InvalidToken('Token revogado')
+        data = super().validate(attrs)
+        # Sem o app de blacklist do SimpleJWT, a revogação após a rotação é feita aqui
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            revoke_tokens(refresh)
+        return data
@@ -0,0 +1,153 @@
+import time
+import logging
+import threading
+from bisect import bisect_left, insort
+from django.db import connection
+from human_app.models import ClientesFinanceiro
+from human_app.services.busca_clientes import normalizar
+
+logger = logging.getLogger('human_app')
+
+
+class AutocompleteIndex:
+    """Índice em memória para autocompletar nomes de clientes ativos.
+
+    Guarda duas listas ordenadas de (chave normalizada, id): uma com o nome
+    completo e outra com o nome a partir de cada palavra, para que 'silva'
+    encontre 'Comercial Silva Ltda'. A consulta é uma busca binária seguida de
+    uma varredura curta, sem acesso ao banco. Os saves de clientes atualizam só
+    as entradas do cliente; a reconstrução completa a cada `ttl` segundos
+    alcança as alterações feitas em outros processos.
+
+    Só a primeira construção é síncrona (e feita por uma única thread). Depois
+    que o `ttl` expira as consultas seguem no índice atual enquanto uma thread
+    em segundo plano o reconstrói; saves ocorridos durante a reconstrução são
+    reaplicados sobre o índice novo.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+        self._thread = None
+        self._pendentes = None  # saves durante a reconstrução: id -> (nome, is_active)
+        self._nomes = []
+        self._palavras = []
+        self._clientes = {}  # id -> nome
+        self._built_at = None
+
+    def build(self):
+        with self._build_lock:
+            self._build()
+
+    def atualizar(self, cliente_id, nome, is_active):
+        with self._lock:
+            if self._pendentes is not None:
+                self._pendentes[cliente_id] = (nome, is_active)
+            if self._built_at is not None:
+                self._atualizar(cliente_id, nome, is_active)
+
+    def remover(self, cliente_id):
+        self.atualizar(cliente_id, None, False)
+
+    def buscar(self, prefixo, limit=10):
+        self._garantir_atualizado()
+        prefixo = normalizar(prefixo).strip()
+        if not prefixo:
+            return []
+        resultado = []
+        vistos = set()
+        with self._lock:
+            # Primeiro quem começa com o prefixo, depois quem tem uma palavra começando com ele
+            for entradas in (self._nomes, self._palavras):
+                index = bisect_left(entradas, (prefixo,))
+                while index < len(entradas) and len(resultado) < limit:
+                    chave, cliente_id = entradas[index]
+                    if not chave.startswith(prefixo):
+                        break
+                    if cliente_id not in vistos:
+                        vistos.add(cliente_id)
+                        resultado.append({'id': cliente_id, 'nome_razao_social': self._clientes[cliente_id]})
+                    index += 1
+        return resultado
+
+    def _garantir_atualizado(self):
+        if self._built_at is None:
+            # Requisições simultâneas esperam uma única construção inicial
+            with self._build_lock:
+                if self._built_at is None:
+                    self._build()
+        elif time.monotonic() - self._built_at > self.ttl:
+            self._schedule_refresh()
+
+    def _build(self):
+        with self._lock:
+            self._pendentes = {}
+        try:
+            clientes = ClientesFinanceiro.objects.filter(is_active=True).values_list('id', 'nome_razao_social')
+            nomes, palavras, por_id = [], [], {}
+            for cliente_id, nome in clientes:
+                por_id[cliente_id] = nome
+                nome_entrada, palavras_entradas = self._entradas(cliente_id, nome)
+                nomes.append(nome_entrada)
+                palavras.extend(palavras_entradas)
+            nomes.sort()
+            palavras.sort()
+            with self._lock:
+                self._nomes, self._palavras, self._clientes = nomes, palavras, por_id
+                for cliente_id, (nome, is_active) in self._pendentes.items():
+                    self._atualizar(cliente_id, nome, is_active)
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pendentes = None
+
+    def _schedule_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._thread = threading.Thread(target=self._background_refresh, name='autocomplete-clientes-refresh', daemon=True)
+        self._thread.start()
+
+    def _background_refresh(self):
+        try:
+            self.build()
+        except Exception as error:
+            with self._lock:
+                # Adia a próxima tentativa em vez de disparar uma thread por requisição
+                self._built_at = time.monotonic()
+            logger.error("Erro ao reconstruir o autocomplete de clientes: %s", error)
+        finally:
+            with self._lock:
+                self._refreshing = False
+            # A thread tem conexão própria com o banco
+            connection.close()
+
+    def _atualizar(self, cliente_id, nome, is_active):
+        self._remover(cliente_id)
+        if is_active:
+            nome_entrada, palavras_entradas = self._entradas(cliente_id, nome)
+            insort(self._nomes, nome_entrada)
+            for entrada in palavras_entradas:
+                insort(self._palavras, entrada)
+            self._clientes[cliente_id] = nome
+
+    def _entradas(self, cliente_id, nome):
+        chave = ' '.join(normalizar(nome).split())
+        palavras = chave.split(' ')
+        return (chave, cliente_id), [(' '.join(palavras[index:]), cliente_id) for index in range(1, len(palavras))]
+
+    def _remover(self, cliente_id):
+        nome = self._clientes.pop(cliente_id, None)
+        if nome is None:
+            return
+        nome_entrada, palavras_entradas = self._entradas(cliente_id, nome)
+        for entradas, entrada in [(self._nomes, nome_entrada)] + [(self._palavras, entrada) for entrada in palavras_entradas]:
+            index = bisect_left(entradas, entrada)
+            if index < len(entradas) and entradas[index] == entrada:
+                del entradas[index]
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,123 @@
+import re
+import unicodedata
+from django.db import transaction
+from django.db.models import Q, F, Case, When, Max, Value, IntegerField
+from human_app.models import ClientesFinanceiro, ClientesFinanceiroBusca
+
+# Peso de cada campo no ranking da busca
+PESOS = {
+    'nome_razao_social': 3,
+    'nome_fantasia': 2,
+    'cnpj': 3,
+    'cpf': 3,
+    'email': 1,
+}
+
+TAMANHO_TERMO = 100
+MAX_TERMOS_BUSCA = 6
+
+
+def normalizar(texto):
+    # Remove acentos e deixa minúsculo: 'Associação' -> 'associacao'
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(char for char in texto if not unicodedata.combining(char)).lower()
+
+
+def somente_digitos(texto):
+    return re.sub(r'\D', '', texto or '')
+
+
+def tokenizar(texto):
+    return re.findall(r'[a-z0-9]+', normalizar(texto))
+
+
+def termos_cliente(cliente):
+    termos = {}
+    for campo in ('nome_razao_social', 'nome_fantasia'):
+        for termo in tokenizar(getattr(cliente, campo)):
+            termos[(termo[:TAMANHO_TERMO], campo)] = PESOS[campo]
+    for campo in ('cnpj', 'cpf'):
+        digitos = somente_digitos(getattr(cliente, campo))
+        if digitos:
+            termos[(digitos, campo)] = PESOS[campo]
+    if cliente.email:
+        email = normalizar(cliente.email).strip()
+        termos[(email[:TAMANHO_TERMO], 'email')] = PESOS['email']
+        for termo in tokenizar(email):
+            termos.setdefault((termo[:TAMANHO_TERMO], 'email'), PESOS['email'])
+    return [
+        ClientesFinanceiroBusca(cliente_id=cliente.pk, termo=termo, campo=campo, peso=peso)
+        for (termo, campo), peso in termos.items()
+    ]
+
+
+def indexar_cliente(cliente):
+    with transaction.atomic():
+        ClientesFinanceiroBusca.objects.filter(cliente_id=cliente.pk).delete()
+        ClientesFinanceiroBusca.objects.bulk_create(termos_cliente(cliente))
+
+
+def reindexar_clientes(batch_size=500):
+    # Apaga e reconstrói o índice numa única transação: buscas concorrentes continuam vendo
+    # o índice antigo até o commit, e uma falha no meio não deixa o índice vazio
+    total = 0
+    with transaction.atomic():
+        ClientesFinanceiroBusca.objects.all().delete()
+        clientes = ClientesFinanceiro.objects.only('id', 'nome_razao_social', 'nome_fantasia', 'cnpj', 'cpf', 'email').order_by('id')
+        termos = []
+        for cliente in clientes.iterator(chunk_size=batch_size):
+            termos.extend(termos_cliente(cliente))
+            total += 1
+            if len(termos) >= batch_size:
+                ClientesFinanceiroBusca.objects.bulk_create(termos)
+                termos = []
+        ClientesFinanceiroBusca.objects.bulk_create(termos)
+    return total
+
+
+def termos_consulta(consulta):
+    # Um CNPJ/CPF digitado com pontuação vira um único termo só com os dígitos
+    if re.fullmatch(r'[\d.\-/\s]+', consulta or '') and somente_digitos(consulta):
+        return [somente_digitos(consulta)]
+    termos = tokenizar(consulta)
+    if '@' in (consulta or ''):
+        termos.append(normalizar(consulta).strip())
+    return list(dict.fromkeys(termo[:TAMANHO_TERMO] for termo in termos))[:MAX_TERMOS_BUSCA]
+
+
+def buscar_clientes(consulta, clientes=None, limit=None):
+    """Busca ranqueada pelo índice de termos.
+
+    Cada termo da consulta precisa casar por prefixo (LIKE 'termo%', atendido
+    pelo índice de `termo`) com algum termo do cliente. Por termo da consulta
+    vale o maior peso entre os campos que casaram, +1 se o termo for igual e
+    não só prefixo; a pontuação é a soma. Retorna [(cliente_id, pontuação)]
+    em ordem decrescente, calculado em uma única consulta.
+    """
+    termos = termos_consulta(consulta)
+    if not termos:
+        return []
+
+    filtro = Q()
+    anotacoes = {}
+    for index, termo in enumerate(termos):
+        filtro |= Q(termo__startswith=termo)
+        anotacoes[f't{index}'] = Max(Case(
+            When(termo=termo, then=F('peso') + 1),
+            When(termo__startswith=termo, then=F('peso')),
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+
+    resultados = ClientesFinanceiroBusca.objects.filter(filtro)
+    if clientes is not None:
+        resultados = resultados.filter(cliente__in=clientes)
+    pontuacao = sum((F(nome) for nome in anotacoes), Value(0))
+    resultados = resultados.values('cliente_id').annotate(**anotacoes) \
+        .filter(**{f'{nome}__gt': 0 for nome in anotacoes}) \
+        .annotate(pontuacao=pontuacao) \
+        .order_by('-pontuacao', 'cliente_id') \
+        .values_list('cliente_id', 'pontuacao')
+    if limit is not None:
+        resultados = resultados[:limit]
+    return list(resultados)
@@ -0,0 +1,119 @@
+import re
+import logging
+from django.conf import settings
+from django.db.models import Q
+from human_app.models import ClientesFinanceiro
+from human_app.services.busca_clientes import somente_digitos
+from human_app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger('human_app')
+
+TAMANHO_CNPJ = 14
+TAMANHO_CPF = 11
+
+# Nome/CNPJ/CPF -> id do cliente. Só resultados encontrados entram no cache,
+# então um cliente recém-criado é resolvido na hora; renomeações e exclusões
+# limpam o cache pelo signal do processo onde aconteceram e o TTL cobre os demais.
+clientes_cache = TTLCache(ttl=getattr(settings, 'CLIENTES_RESOLVER_CACHE_TTL', 300))
+
+
+def normalizar_documentos(cliente):
+    """Preenche as chaves indexadas e únicas, só com os dígitos: '12.345.678/0001-90' -> '12345678000190'.
+
+    Se outro cliente já tem o mesmo documento (duplicados anteriores à chave
+    única, deixados sem chave pela migração 0007) a chave fica NULL, para que
+    o save não falhe no índice único.
+    """
+    for origem, campo in (('cnpj', 'cnpj_digitos'), ('cpf', 'cpf_digitos')):
+        digitos = somente_digitos(getattr(cliente, origem)) or None
+        if digitos and ClientesFinanceiro.objects.filter(**{campo: digitos}).exclude(pk=cliente.pk).exists():
+            logger.warning("Cliente %s: %s %s já pertence a outro cliente, chave não preenchida", cliente.pk, origem, digitos)
+            digitos = None
+        setattr(cliente, campo, digitos)
+
+
+def tipo_chave(valor):
+    # Um documento tem só dígitos e pontuação; qualquer outra coisa é tratada como nome
+    if re.fullmatch(r'[\d.\-/\s]+', valor):
+        digitos = somente_digitos(valor)
+        if len(digitos) == TAMANHO_CNPJ:
+            return 'cnpj_digitos', digitos
+        if len(digitos) == TAMANHO_CPF:
+            return 'cpf_digitos', digitos
+    return 'nome_razao_social', valor
+
+
+def resolver_cliente_id(valor):
+    """Retorna o id do cliente pela razão social, CNPJ ou CPF, ou None.
+
+    Razão social não é única: havendo homônimos vale o cliente de menor id,
+    o mesmo que o índice (nome_razao_social, id) devolve primeiro.
+    """
+    valor = str(valor or '').strip()
+    if not valor:
+        return None
+    campo, chave = tipo_chave(valor)
+    cliente_id = clientes_cache.get((campo, chave))
+    if cliente_id is None:
+        cliente_id = ClientesFinanceiro.objects.filter(**{campo: chave}).order_by('id').values_list('id', flat=True).first()
+        if cliente_id is not None:
+            clientes_cache.set((campo, chave), cliente_id)
+    return cliente_id
+
+
+def resolver_clientes_ids(valores):
+    """Resolve vários clientes de uma vez: retorna {valor: id} só com os encontrados.
+
+    Inteiros são ids (conferidos no banco); textos seguem a regra de
+    resolver_cliente_id. O que não está em cache sai de uma única consulta.
+    """
+    resolvidos = {}
+    pendentes = {}
+    for valor in valores:
+        if isinstance(valor, int) and not isinstance(valor, bool):
+            pendentes[valor] = ('id', valor)
+            continue
+        valor = str(valor or '').strip()
+        if not valor or valor in resolvidos or valor in pendentes:
+            continue
+        campo, chave = tipo_chave(valor)
+        cliente_id = clientes_cache.get((campo, chave))
+        if cliente_id is None:
+            pendentes[valor] = (campo, chave)
+        else:
+            resolvidos[valor] = cliente_id
+    if not pendentes:
+        return resolvidos
+
+    filtro = Q()
+    for campo in ('id', 'nome_razao_social', 'cnpj_digitos', 'cpf_digitos'):
+        chaves = {chave for campo_pendente, chave in pendentes.values() if campo_pendente == campo}
+        if chaves:
+            filtro |= Q(**{f'{campo}__in': chaves})
+    encontrados = {}
+    # Do maior para o menor id: entre homônimos o de menor id é gravado por último, como em resolver_cliente_id
+    for cliente in ClientesFinanceiro.objects.filter(filtro).order_by('-id').values('id', 'nome_razao_social', 'cnpj_digitos', 'cpf_digitos'):
+        for campo in ('id', 'nome_razao_social', 'cnpj_digitos', 'cpf_digitos'):
+            encontrados[(campo, cliente[campo])] = cliente['id']
+    for valor, chave in pendentes.items():
+        cliente_id = encontrados.get(chave)
+        if cliente_id is not None:
+            resolvidos[valor] = cliente_id
+            if chave[0] != 'id':
+                clientes_cache.set(chave, cliente_id)
+    return resolvidos
+
+
+def resolver_cliente(valor):
+    cliente_id = resolver_cliente_id(valor)
+    if cliente_id is None:
+        return None
+    return ClientesFinanceiro.objects.filter(id=cliente_id).first()
+
+
+def invalidate_clientes_resolver():
+    clientes_cache.clear()
+
+
+def clientes_resolver_stats():
+    return clientes_cache.stats()
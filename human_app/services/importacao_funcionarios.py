@@ -0,0 +1,141 @@
+import io
+import csv
+import json
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from human_app.models import User, Funcionarios
+from human_app.services.password_hashing import hash_passwords_parallel
+
+CAMPOS_OBRIGATORIOS = ('username', 'email', 'password')
+CAMPOS_USER = ('username', 'email', 'first_name', 'last_name')
+CAMPOS_FUNCIONARIO = ('rg', 'cpf', 'telefone_celular')
+
+
+def ler_arquivo(conteudo, nome_arquivo=''):
+    """Aceita CSV (separado por ',' ou ';') ou JSON (lista ou {"funcionarios": [...]}).
+
+    Arquivo vazio ou fora do formato gera ValueError, tratado como 400 pela
+    view e como erro de leitura pelo comando.
+    """
+    if isinstance(conteudo, bytes):
+        conteudo = conteudo.decode('utf-8-sig')
+    if not conteudo.strip():
+        raise ValueError('arquivo vazio')
+    if nome_arquivo.lower().endswith('.json') or conteudo.lstrip().startswith(('[', '{')):
+        data = json.loads(conteudo)
+        linhas = data.get('funcionarios', []) if isinstance(data, dict) else data
+        if not isinstance(linhas, list) or not all(isinstance(linha, dict) for linha in linhas):
+            raise ValueError('o JSON deve ser uma lista de objetos')
+        return linhas
+    try:
+        dialect = csv.Sniffer().sniff(conteudo.lstrip().splitlines()[0], delimiters=',;')
+        return [dict(row) for row in csv.DictReader(io.StringIO(conteudo.lstrip()), dialect=dialect)]
+    except csv.Error as error:
+        raise ValueError(f'CSV inválido: {error}')
+
+
+def hash_passwords(passwords):
+    # Com o hasher padrão PBKDF2 os hashes são calculados em paralelo; senão, um a um
+    hasher = get_hasher('default')
+    min_parallel = getattr(settings, 'IMPORTACAO_MIN_HASH_PARALELO', 8)
+    if hasher.algorithm != 'pbkdf2_sha256' or len(passwords) < min_parallel:
+        return [make_password(password) for password in passwords]
+    salts = [hasher.salt() for _ in passwords]
+    return hash_passwords_parallel(passwords, salts, hasher.iterations, getattr(settings, 'IMPORTACAO_HASH_WORKERS', None))
+
+
+def validar_linhas(linhas):
+    results = {}
+    validas = []
+    usernames = set()
+    emails = set()
+    for index, linha in enumerate(linhas, start=1):
+        if not isinstance(linha, dict):
+            results[index] = {"status": "error", "code": 400, "linha": index, "username": None, "error": "Linha inválida: esperado um objeto."}
+            continue
+        linha = {str(key).strip(): (value.strip() if isinstance(value, str) else value) for key, value in linha.items() if key}
+        faltando = [campo for campo in CAMPOS_OBRIGATORIOS if not linha.get(campo)]
+        if faltando:
+            results[index] = {"status": "error", "code": 400, "linha": index, "username": linha.get('username'), "error": f"Campos obrigatórios: {', '.join(faltando)}"}
+            continue
+        try:
+            validate_email(linha['email'])
+        except ValidationError:
+            results[index] = {"status": "error", "code": 400, "linha": index, "username": linha['username'], "error": "Email inválido."}
+            continue
+        if linha['username'] in usernames or linha['email'] in emails:
+            results[index] = {"status": "error", "code": 400, "linha": index, "username": linha['username'], "error": "Usuário ou email repetido no arquivo."}
+            continue
+        usernames.add(linha['username'])
+        emails.add(linha['email'])
+        validas.append((index, linha))
+    return results, validas
+
+
+def gravar_funcionarios(novas, users):
+    # Grava User e Funcionarios das linhas; retorna {username: id}
+    User.objects.bulk_create(users)
+    # O MySQL não devolve os ids do bulk_create, então eles são lidos em uma consulta
+    ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'id'))
+    Funcionarios.objects.bulk_create([
+        Funcionarios(user_id=ids[linha['username']], **{campo: linha.get(campo) or None for campo in CAMPOS_FUNCIONARIO})
+        for _, linha in novas
+    ])
+    return ids
+
+
+def importar_funcionarios(linhas):
+    """Cadastra vários funcionários de uma vez.
+
+    Uma consulta verifica usuários e emails já existentes, as senhas são
+    processadas em paralelo e User e Funcionarios são gravados com
+    bulk_create na mesma transação. Como no cadastro individual, os usuários
+    são criados inativos. Retorna um resultado por linha.
+    """
+    results, validas = validar_linhas(linhas)
+
+    if validas:
+        existentes = User.objects.filter(
+            Q(username__in=[linha['username'] for _, linha in validas]) |
+            Q(email__in=[linha['email'] for _, linha in validas])
+        ).values_list('username', 'email')
+        usernames_existentes = {username for username, _ in existentes}
+        emails_existentes = {email for _, email in existentes}
+
+        novas = []
+        for index, linha in validas:
+            if linha['username'] in usernames_existentes:
+                results[index] = {"status": "error", "code": 400, "linha": index, "username": linha['username'], "error": "Esse nome de usuário já existe."}
+            elif linha['email'] in emails_existentes:
+                results[index] = {"status": "error", "code": 400, "linha": index, "username": linha['username'], "error": "Esse email já existe."}
+            else:
+                novas.append((index, linha))
+
+        if novas:
+            passwords = hash_passwords([linha['password'] for _, linha in novas])
+            users = [
+                User(**{campo: linha.get(campo) or '' for campo in CAMPOS_USER}, password=password, is_active=False)
+                for (_, linha), password in zip(novas, passwords)
+            ]
+            try:
+                with transaction.atomic():
+                    criadas = gravar_funcionarios(novas, users)
+            except IntegrityError:
+                # Outro cadastro gravou o mesmo usuário/email entre a verificação e o insert:
+                # grava linha a linha para reportar só as linhas em conflito
+                criadas = {}
+                for (index, linha), user in zip(novas, users):
+                    try:
+                        with transaction.atomic():
+                            criadas.update(gravar_funcionarios([(index, linha)], [user]))
+                    except IntegrityError:
+                        results[index] = {"status": "error", "code": 400, "linha": index, "username": linha['username'], "error": "Usuário ou email já existe."}
+            for index, linha in novas:
+                if linha['username'] in criadas:
+                    results[index] = {"status": "success", "code": 201, "linha": index, "username": linha['username'], "id": criadas[linha['username']]}
+
+    return [results[index] for index in sorted(results)]
@@ -0,0 +1,29 @@
+import base64
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Este módulo não importa o Django: os processos do pool (spawn) só precisam dele.
+
+
+def pbkdf2_sha256(password, salt, iterations):
+    # Mesmo formato do PBKDF2PasswordHasher do Django: pbkdf2_sha256$<iterações>$<salt>$<hash>
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations)
+    encoded = base64.b64encode(digest).decode('ascii').strip()
+    return f"pbkdf2_sha256${iterations}${salt}${encoded}"
+
+
+def _pbkdf2_sha256_args(args):
+    return pbkdf2_sha256(*args)
+
+
+def hash_passwords_parallel(passwords, salts, iterations, max_workers=None):
+    """Calcula os hashes PBKDF2 das senhas em um pool de processos.
+
+    Usa o contexto 'spawn' para não herdar threads e locks do processo do
+    servidor. Retorna os hashes na mesma ordem das senhas.
+    """
+    args = [(password, salt, iterations) for password, salt in zip(passwords, salts)]
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        return list(executor.map(_pbkdf2_sha256_args, args, chunksize=max(1, len(args) // 32)))
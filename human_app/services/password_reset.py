@@ -0,0 +1,80 @@
+import time
+import logging
+import threading
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from human_app.models import PasswordResetTokens
+
+logger = logging.getLogger('human_app')
+
+
+def purge_expired_tokens(batch_size=1000, max_batches=None, pause=0):
+    """Apaga tokens de redefinição expirados em lotes de até `batch_size` linhas.
+
+    Cada lote é um SELECT pelo índice de `expires_in` seguido de um DELETE por
+    id, para não segurar locks na tabela inteira. Retorna o total apagado.
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(PasswordResetTokens.objects.filter(expires_in__lt=timezone.now())
+                   .order_by('expires_in').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted, _ = PasswordResetTokens.objects.filter(id__in=ids).delete()
+        total += deleted
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def enforce_user_token_cap(user, max_tokens=None):
+    # Abre espaço para um novo token: apaga os expirados do usuário e os mais antigos além do limite
+    if max_tokens is None:
+        max_tokens = getattr(settings, 'PASSWORD_RESET_MAX_TOKENS_PER_USER', 3)
+    tokens = PasswordResetTokens.objects.filter(user=user)
+    tokens.filter(expires_in__lt=timezone.now()).delete()
+    excess = list(tokens.order_by('-created_at', '-id').values_list('id', flat=True)[max(max_tokens - 1, 0):])
+    if excess:
+        PasswordResetTokens.objects.filter(id__in=excess).delete()
+
+
+class PurgeScheduler(threading.Thread):
+    """Thread que roda `purge_expired_tokens` a cada `interval` segundos."""
+
+    def __init__(self, interval, batch_size=1000):
+        super().__init__(name='password-reset-purge', daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                deleted = purge_expired_tokens(self.batch_size)
+                if deleted:
+                    logger.info("Tokens de redefinição expirados removidos: %s", deleted)
+            except Exception as error:
+                logger.error("Erro ao remover tokens de redefinição expirados: %s", error)
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def start_purge_scheduler():
+    global _scheduler
+    interval = getattr(settings, 'PASSWORD_RESET_PURGE_INTERVAL', None)
+    if not interval or _scheduler is not None:
+        return None
+    _scheduler = PurgeScheduler(interval, getattr(settings, 'PASSWORD_RESET_PURGE_BATCH_SIZE', 1000))
+    _scheduler.start()
+    return _scheduler
@@ -0,0 +1,79 @@
+from django.contrib.auth.models import Group
+from human_app.models import Robos
+from human_app.services.ttl_cache import TTLCache
+
+# Grupos com acesso a todas as categorias de robôs
+GRUPOS_TODAS_CATEGORIAS = {'ADMIN', 'TI'}
+
+# Categoria de robôs liberada para cada grupo
+CATEGORIAS_POR_GRUPO = {
+    'RH_OPERACAO': 'RH',
+    'RH_GERENCIA': 'RH',
+    'FINANCEIRO_OPERACAO': 'FINANCEIRO',
+}
+
+_CATEGORIAS_KEY = 'categorias'
+
+groups_cache = TTLCache(ttl=300)
+categorias_cache = TTLCache(ttl=300, max_entries=1)
+
+
+def get_user_groups(user_id):
+    # Chave como texto, igual ao cache de usuários, aceitando o id do token ou do model
+    groups = groups_cache.get(str(user_id))
+    if groups is None:
+        groups = frozenset(Group.objects.filter(user=user_id).values_list('name', flat=True))
+        groups_cache.set(str(user_id), groups)
+    return groups
+
+
+def groups_from_token(token):
+    # Tokens emitidos antes das claims de perfil não têm 'groups'
+    if token is None or 'groups' not in token:
+        return None
+    return frozenset(token['groups'])
+
+
+def get_request_groups(request):
+    # Prefere os grupos assinados no token de acesso; senão consulta o cache
+    groups = groups_from_token(request.auth)
+    if groups is None:
+        groups = get_user_groups(request.user.id)
+    return groups
+
+
+def get_robos_categorias():
+    categorias = categorias_cache.get(_CATEGORIAS_KEY)
+    if categorias is None:
+        categorias = frozenset(Robos.objects.values_list('categoria', flat=True).distinct())
+        categorias_cache.set(_CATEGORIAS_KEY, categorias)
+    return categorias
+
+
+def get_categorias_permitidas(user_groups, categoria=None):
+    categorias_permitidas = set()
+
+    if user_groups & GRUPOS_TODAS_CATEGORIAS:
+        # Se a categoria foi informada, libera só ela; senão libera todas
+        if categoria:
+            categorias_permitidas.add(categoria)
+        else:
+            categorias_permitidas.update(get_robos_categorias())
+
+    for group in user_groups:
+        if group in CATEGORIAS_POR_GRUPO:
+            categorias_permitidas.add(CATEGORIAS_POR_GRUPO[group])
+
+    return categorias_permitidas
+
+
+def invalidate_user_groups(*user_ids):
+    groups_cache.delete(*(str(user_id) for user_id in user_ids))
+
+
+def invalidate_all_groups():
+    groups_cache.clear()
+
+
+def invalidate_robos_categorias():
+    categorias_cache.clear()
@@ -0,0 +1,83 @@
+from collections import defaultdict
+from django.db import connection, transaction
+from django.db.models import Q, Sum, Value, FloatField
+from django.db.models.functions import Coalesce
+from human_app.models import ClientesFinanceiroValores, ClientesFinanceiroValesSST
+
+# Colunas da grade mensal de vales e SST
+CAMPOS_VALES_SST = ['vale_transporte', 'assinat_eletronica', 'vale_refeicao', 'mensal_ponto_elet', 'saude_seguranca_trabalho']
+
+
+def totais_vales_sst(valores):
+    # Totais por (cliente, ano, mes) calculados no banco
+    return valores.values('cliente_id', 'ano', 'mes').annotate(**{
+        campo: Coalesce(Sum(campo), Value(0.0, output_field=FloatField()))
+        for campo in CAMPOS_VALES_SST
+    }).order_by()
+
+
+def gravar_resumos(linhas, batch_size=500):
+    opcoes = {}
+    if connection.features.supports_update_conflicts_with_target:
+        opcoes['unique_fields'] = ['cliente', 'ano', 'mes']
+    ClientesFinanceiroValesSST.objects.bulk_create(
+        [
+            ClientesFinanceiroValesSST(cliente_id=linha['cliente_id'], ano=linha['ano'], mes=linha['mes'], **{campo: linha[campo] for campo in CAMPOS_VALES_SST})
+            for linha in linhas
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=CAMPOS_VALES_SST + ['updated_at'],
+        **opcoes,
+    )
+
+
+def filtro_chaves(chaves):
+    por_periodo = defaultdict(set)
+    for cliente_id, ano, mes in chaves:
+        por_periodo[(ano, mes)].add(cliente_id)
+    filtro = Q()
+    for (ano, mes), clientes in por_periodo.items():
+        filtro |= Q(ano=ano, mes=mes, cliente_id__in=clientes)
+    return filtro
+
+
+def atualizar_resumo_vales_sst(chaves):
+    """Recalcula o resumo só dos (cliente_id, ano, mes) informados.
+
+    Chamado pelos signals de ClientesFinanceiroValores e pelas gravações em
+    lote, que não disparam signals. Chaves sem valores saem do resumo.
+    """
+    chaves = {chave for chave in chaves if None not in chave}
+    if not chaves:
+        return
+    with transaction.atomic():
+        linhas = list(totais_vales_sst(ClientesFinanceiroValores.objects.filter(filtro_chaves(chaves))))
+        if linhas:
+            gravar_resumos(linhas)
+        removidas = chaves - {(linha['cliente_id'], linha['ano'], linha['mes']) for linha in linhas}
+        if removidas:
+            ClientesFinanceiroValesSST.objects.filter(filtro_chaves(removidas)).delete()
+
+
+def reconstruir_resumo_vales_sst(ano=None, batch_size=1000):
+    # Reconstrói o resumo inteiro (ou de um ano) a partir de clientes_financeiro_valores
+    valores = ClientesFinanceiroValores.objects.all()
+    resumos = ClientesFinanceiroValesSST.objects.all()
+    if ano is not None:
+        valores = valores.filter(ano=ano)
+        resumos = resumos.filter(ano=ano)
+    total = 0
+    with transaction.atomic():
+        resumos.delete()
+        lote = []
+        for linha in totais_vales_sst(valores).iterator():
+            lote.append(linha)
+            if len(lote) >= batch_size:
+                gravar_resumos(lote)
+                total += len(lote)
+                lote = []
+        if lote:
+            gravar_resumos(lote)
+            total += len(lote)
+    return total
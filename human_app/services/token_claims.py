@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from rest_framework_simplejwt.settings import api_settings
+from human_app.models import Funcionarios
+from human_app.services.permissions import get_user_groups
+
+# Campos de exibição do usuário e do funcionário copiados para o token como claims
+# assinadas. O token vai em cookie e qualquer um lê o payload com um base64, então
+# documentos e contato (rg, cpf, telefone, email) ficam de fora: o perfil completo
+# só sai do login lido do banco (?completo=true).
+USER_CLAIMS = ('username', 'first_name', 'last_name', 'is_active', 'is_staff', 'last_login')
+FUNCIONARIO_CLAIMS = ('situacao',)
+DATETIME_CLAIMS = ('last_login',)
+
+
+def get_profile_claims(user):
+    funcionario = Funcionarios.objects.filter(user=user).values(*FUNCIONARIO_CLAIMS).first() or {}
+    claims = {field: getattr(user, field) for field in USER_CLAIMS}
+    for field in DATETIME_CLAIMS:
+        # Mesmo formato que o serializer devolve
+        if claims[field] is not None:
+            claims[field] = serializers.DateTimeField().to_representation(claims[field])
+    for field in FUNCIONARIO_CLAIMS:
+        claims[field] = funcionario.get(field)
+    claims['groups'] = sorted(get_user_groups(user.id))
+    return claims
+
+
+def add_profile_claims(token, user):
+    for key, value in get_profile_claims(user).items():
+        token[key] = value
+    return token
+
+
+def profile_from_token(token):
+    # Tokens emitidos antes das claims de perfil voltam para a leitura do banco
+    if token is None or any(field not in token for field in USER_CLAIMS + FUNCIONARIO_CLAIMS + ('groups',)):
+        return None
+    # O simplejwt guarda o id como texto; o login lido do banco devolve inteiro
+    profile = {'id': int(token[api_settings.USER_ID_CLAIM])}
+    for field in USER_CLAIMS + FUNCIONARIO_CLAIMS + ('groups',):
+        profile[field] = token[field]
+    return profile
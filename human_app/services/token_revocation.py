@@ -0,0 +1,113 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from human_app.models import RevokedTokens
+
+logger = logging.getLogger('human_app')
+
+
+class RevocationList:
+    """Lista de tokens revogados (por jti) com cópia em memória.
+
+    A consulta `is_revoked` é um lookup em dicionário. A cópia em memória é
+    sincronizada com a tabela `revoked_tokens` no máximo a cada
+    `sync_interval` segundos, buscando as linhas criadas desde a última
+    sincronização menos uma janela de `sync_overlap` segundos: uma linha de
+    outro worker cujo commit sai depois de linhas mais novas ainda é vista
+    na sincronização seguinte.
+    Entradas expiradas somem da memória na sincronização e do banco a cada
+    `purge_interval` segundos, já que um token expirado é rejeitado de
+    qualquer forma.
+    """
+
+    def __init__(self, sync_interval=30, purge_interval=3600, sync_overlap=60):
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap
+        self.purge_interval = purge_interval
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._revoked = {}  # jti -> timestamp de expiração
+        self._last_created_at = None
+        self._synced_at = None
+        self._purged_at = time.monotonic()
+
+    def revoke(self, *tokens):
+        rows = []
+        for token in tokens:
+            jti = token.get(api_settings.JTI_CLAIM)
+            exp = token.get('exp')
+            if not jti or not exp:
+                continue
+            rows.append(RevokedTokens(
+                jti=jti,
+                token_type=token.get(api_settings.TOKEN_TYPE_CLAIM, ''),
+                expires_at=datetime.fromtimestamp(exp, tz=dt_timezone.utc),
+            ))
+        if not rows:
+            return
+        RevokedTokens.objects.bulk_create(rows, ignore_conflicts=True)
+        with self._lock:
+            for row in rows:
+                self._revoked[row.jti] = row.expires_at.timestamp()
+
+    def is_revoked(self, jti):
+        self._maybe_sync()
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def sync(self):
+        now = timezone.now()
+        rows = RevokedTokens.objects.filter(expires_at__gt=now)
+        if self._last_created_at is not None:
+            # Relê a janela final: created_at é gravado antes do commit, então uma
+            # transação mais lenta pode aparecer com created_at menor que o já visto
+            rows = rows.filter(created_at__gte=self._last_created_at - timedelta(seconds=self.sync_overlap))
+        rows = rows.values_list('jti', 'expires_at', 'created_at')
+        with self._lock:
+            for jti, expires_at, created_at in rows:
+                self._revoked[jti] = expires_at.timestamp()
+                if self._last_created_at is None or created_at > self._last_created_at:
+                    self._last_created_at = created_at
+            agora = time.time()
+            self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > agora}
+            self._synced_at = time.monotonic()
+        if time.monotonic() - self._purged_at > self.purge_interval:
+            self._purged_at = time.monotonic()
+            self.purge_expired()
+
+    def purge_expired(self):
+        deleted, _ = RevokedTokens.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def _maybe_sync(self):
+        if self._synced_at is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        # Só uma thread sincroniza; as outras seguem com a cópia atual
+        if not self._sync_lock.acquire(blocking=self._synced_at is None):
+            return
+        try:
+            self.sync()
+        except Exception as error:
+            # Mantém a cópia atual e tenta de novo só no próximo intervalo
+            self._synced_at = time.monotonic()
+            logger.error("Erro ao sincronizar tokens revogados: %s", error)
+        finally:
+            self._sync_lock.release()
+
+
+revocation_list = RevocationList(
+    sync_interval=getattr(settings, 'REVOKED_TOKENS_SYNC_INTERVAL', 30),
+    sync_overlap=getattr(settings, 'REVOKED_TOKENS_SYNC_OVERLAP', 60),
+)
+
+
+def revoke_tokens(*tokens):
+    revocation_list.revoke(*tokens)
+
+
+def is_token_revoked(token):
+    return revocation_list.is_revoked(token.get(api_settings.JTI_CLAIM))
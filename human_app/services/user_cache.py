@@ -0,0 +1,31 @@
+from django.conf import settings
+from human_app.services.ttl_cache import TTLCache
+
+# Usuários resolvidos a partir do token, por id. O TTL é curto porque as
+# invalidações por signal só alcançam o processo onde o save aconteceu.
+user_cache = TTLCache(ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60))
+
+
+def user_key(user_id):
+    # O simplejwt guarda o id como texto na claim ('1'); signals e views usam int
+    return str(user_id)
+
+
+def get_cached_user(user_id):
+    return user_cache.get(user_key(user_id))
+
+
+def cache_user(user_id, user):
+    user_cache.set(user_key(user_id), user)
+
+
+def invalidate_users(*user_ids):
+    user_cache.delete(*(user_key(user_id) for user_id in user_ids))
+
+
+def invalidate_all_users():
+    user_cache.clear()
+
+
+def user_cache_stats():
+    return user_cache.stats()
@@ -0,0 +1,46 @@
+from django.db import connection, transaction
+from human_app.models import ClientesFinanceiroValores
+from human_app.services.resumo_vales_sst import CAMPOS_VALES_SST, atualizar_resumo_vales_sst
+
+# Campos de valores somáveis (as linhas duplicadas de um mesmo (cliente, ano, mes)
+# foram mescladas somando estes campos na migração 0008)
+CAMPOS_SOMA = [
+    'convenio_farmacia', 'adiant_salarial', 'numero_empregados', 'numero_estagiarios',
+    'trabalhando', 'salario_contri_empregados', 'salario_contri_contribuintes',
+    'soma_salarios_provdt', 'inss', 'fgts', 'irrf', 'salarios_pagar', 'vale_transporte',
+    'assinat_eletronica', 'vale_refeicao', 'mensal_ponto_elet', 'saude_seguranca_trabalho',
+    'economia_mensal', 'economia_liquida', 'total_fatura',
+]
+# Percentual e indicadores de envio não se somam
+CAMPOS_MAX = ['percentual_human', 'anexo_enviado', 'relatorio_enviado']
+
+CAMPOS_VALORES = ['cod_empresa'] + CAMPOS_SOMA + CAMPOS_MAX
+CHAVE_VALORES = ['cliente', 'ano', 'mes']
+
+
+def bulk_upsert_valores(linhas, update_fields, batch_size=500):
+    """Insere ou atualiza as linhas pela chave única (cliente, ano, mes) em um INSERT ... ON DUPLICATE KEY UPDATE.
+
+    `linhas` são instâncias de ClientesFinanceiroValores não salvas; só
+    `update_fields` são sobrescritos nas linhas que já existem.
+    """
+    opcoes = {}
+    if connection.features.supports_update_conflicts_with_target:
+        opcoes['unique_fields'] = CHAVE_VALORES
+    ClientesFinanceiroValores.objects.bulk_create(
+        linhas,
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=list(update_fields) + ['updated_at'],
+        **opcoes,
+    )
+    # bulk_create não dispara signals: o resumo de vales/SST é atualizado aqui
+    atualizar_resumo_vales_sst((linha.cliente_id, linha.ano, linha.mes) for linha in linhas)
+
+
+def upsert_valores(cliente_id, ano, mes, **valores):
+    # Escrita mensal atômica de um cliente; retorna (linha, criada)
+    with transaction.atomic():
+        criada = not ClientesFinanceiroValores.objects.filter(cliente_id=cliente_id, ano=ano, mes=mes).exists()
+        bulk_upsert_valores([ClientesFinanceiroValores(cliente_id=cliente_id, ano=ano, mes=mes, **valores)], valores.keys())
+    return ClientesFinanceiroValores.objects.get(cliente_id=cliente_id, ano=ano, mes=mes), criada
@@ -0,0 +1,88 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.contrib.auth.models import User, Group
+from human_app.models import Funcionarios, Robos, ClientesFinanceiro, ClientesFinanceiroValores
+from human_app.services.user_cache import invalidate_users, invalidate_all_users
+from human_app.services.busca_clientes import indexar_cliente
+from human_app.services.autocomplete_clientes import autocomplete_index
+from human_app.services.clientes_resolver import normalizar_documentos, invalidate_clientes_resolver
+from human_app.services.resumo_vales_sst import atualizar_resumo_vales_sst
+from human_app.services.permissions import invalidate_user_groups as invalidate_groups_cache, invalidate_all_groups, invalidate_robos_categorias
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_users(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Funcionarios)
+def invalidate_funcionario(sender, instance, **kwargs):
+    invalidate_users(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Group)
+def invalidate_group(sender, instance, **kwargs):
+    invalidate_all_users()
+    invalidate_all_groups()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_users(instance.pk)
+        invalidate_groups_cache(instance.pk)
+    elif pk_set:
+        invalidate_users(*pk_set)
+        invalidate_groups_cache(*pk_set)
+    else:
+        # post_clear a partir do grupo: não há como saber quais usuários foram afetados
+        invalidate_all_users()
+        invalidate_all_groups()
+
+
+@receiver([post_save, post_delete], sender=Robos)
+def invalidate_robo(sender, instance, **kwargs):
+    invalidate_robos_categorias()
+
+
+@receiver(pre_save, sender=ClientesFinanceiro)
+def normalizar_cliente_financeiro(sender, instance, **kwargs):
+    normalizar_documentos(instance)
+
+
+@receiver(post_save, sender=ClientesFinanceiro)
+def indexar_cliente_financeiro(sender, instance, raw=False, **kwargs):
+    if not raw:
+        indexar_cliente(instance)
+        autocomplete_index.atualizar(instance.pk, instance.nome_razao_social, instance.is_active)
+        invalidate_clientes_resolver()
+
+
+@receiver(post_delete, sender=ClientesFinanceiro)
+def remover_cliente_financeiro(sender, instance, **kwargs):
+    autocomplete_index.remover(instance.pk)
+    invalidate_clientes_resolver()
+
+
+@receiver(pre_save, sender=ClientesFinanceiroValores)
+def guardar_periodo_valores(sender, instance, raw=False, **kwargs):
+    # Se o cliente/ano/mês da linha mudar, o resumo do período antigo também precisa ser refeito
+    instance._periodo_anterior = None
+    if instance.pk and not raw:
+        instance._periodo_anterior = sender.objects.filter(pk=instance.pk).values_list('cliente_id', 'ano', 'mes').first()
+
+
+@receiver(post_save, sender=ClientesFinanceiroValores)
+def atualizar_resumo_valores(sender, instance, raw=False, **kwargs):
+    if not raw:
+        chaves = [(instance.cliente_id, instance.ano, instance.mes)]
+        if getattr(instance, '_periodo_anterior', None):
+            chaves.append(instance._periodo_anterior)
+        atualizar_resumo_vales_sst(chaves)
+
+
+@receiver(post_delete, sender=ClientesFinanceiroValores)
+def remover_resumo_valores(sender, instance, **kwargs):
+    atualizar_resumo_vales_sst([(instance.cliente_id, instance.ano, instance.mes)])
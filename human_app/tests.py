@@ -1,3 +1,651 @@
-from django.test import TestCase
+import base64
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User, Group
+from django.db import IntegrityError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+import aws_parameters
+from aws_parameters import ParameterCache
+from human_project.log_handlers import AsyncQueueHandler, JsonFormatter
+from human_project.mysql_pool.pool import ConnectionPool, PoolTimeout, get_pool, pool_stats
+from human_app.models import (
+    ClientesFinanceiro, ClientesFinanceiroBusca, ClientesFinanceiroFolhaPonto, ClientesFinanceiroReembolsos,
+    ClientesFinanceiroValesSST, ClientesFinanceiroValores, Funcionarios, PasswordResetTokens, RevokedTokens, Robos,
+)
+from human_app.serializers import UserSerializer
+from human_app.serializers.user_serial import CustomTokenObtainPairSerializer
+from human_app.services import busca_clientes, importacao_funcionarios
+from human_app.services.autocomplete_clientes import AutocompleteIndex
+from human_app.services.password_reset import enforce_user_token_cap, purge_expired_tokens
+from human_app.services.permissions import get_categorias_permitidas, get_user_groups
+from human_app.services.token_revocation import RevocationList
+from human_app.services.user_cache import cache_user, get_cached_user, invalidate_all_users, invalidate_users
+from human_app.services.valores_financeiro import upsert_valores
 
-# Create your tests here.
+SENHA = 'senha-forte-123'
+
+
+def criar_usuario(username, **campos):
+    return User.objects.create_user(username=username, password=SENHA, **campos)
+
+
+def autenticar(user):
+    # Cliente da API já autenticado, sem passar pelo login/cookies
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+
+class NormalizarDocumentosTests(TestCase):
+    def test_preenche_chaves_so_com_digitos(self):
+        cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente A', cnpj='12.345.678/0001-90', cpf='123.456.789-01', regiao='SP')
+        self.assertEqual(cliente.cnpj_digitos, '12345678000190')
+        self.assertEqual(cliente.cpf_digitos, '12345678901')
+
+    def test_save_de_documento_duplicado_nao_viola_chave_unica(self):
+        original = ClientesFinanceiro.objects.create(nome_razao_social='Cliente A', cnpj='12.345.678/0001-90', regiao='SP')
+        duplicado = ClientesFinanceiro.objects.create(nome_razao_social='Cliente B', cnpj='12345678000190', regiao='SP')
+        self.assertIsNone(duplicado.cnpj_digitos)
+
+        duplicado.is_active = False
+        duplicado.save()
+
+        original.refresh_from_db()
+        duplicado.refresh_from_db()
+        self.assertEqual(original.cnpj_digitos, '12345678000190')
+        self.assertIsNone(duplicado.cnpj_digitos)
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        invalidate_all_users()
+
+    def test_invalidacao_com_id_inteiro_remove_usuario_cacheado_pela_claim(self):
+        cache_user('1', object())
+        self.assertIsNotNone(get_cached_user(1))
+
+        invalidate_users(1)
+
+        self.assertIsNone(get_cached_user('1'))
+
+    def test_desativar_usuario_invalida_o_cache(self):
+        user = criar_usuario('cache')
+        cache_user(str(user.pk), user)
+
+        user.is_active = False
+        user.save()
+
+        self.assertIsNone(get_cached_user(str(user.pk)))
+
+    def test_metricas_exige_staff(self):
+        client = autenticar(criar_usuario('comum'))
+        self.assertEqual(client.get('/api/metricas/', secure=True).status_code, 403)
+
+        client.force_authenticate(criar_usuario('staff', is_staff=True))
+        response = client.get('/api/metricas/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hit_rate', response.data['user_cache'])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = autenticar(criar_usuario('paginacao'))
+        for nome in ('Cliente C', 'Cliente A', 'Cliente B'):
+            ClientesFinanceiro.objects.create(nome_razao_social=nome, regiao='SP')
+
+    def test_percorre_as_paginas_pelo_link_next(self):
+        response = self.client.get('/api/clientes_financeiro/', {'paginacao': 'cursor', 'limit': 2}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([cliente['nome_razao_social'] for cliente in response.data['results']], ['Cliente A', 'Cliente B'])
+
+        response = self.client.get(response.data['next'], secure=True)
+        self.assertEqual([cliente['nome_razao_social'] for cliente in response.data['results']], ['Cliente C'])
+        self.assertIsNone(response.data['next'])
+
+    def test_cursor_invalido_retorna_400(self):
+        cursores = ['nao-e-base64!', base64.urlsafe_b64encode(b'{"a": 1}').decode(), base64.urlsafe_b64encode(b'[["x"], 1]').decode(), base64.urlsafe_b64encode(b'["Cliente A", "abc"]').decode()]
+        for cursor in cursores:
+            response = self.client.get('/api/clientes_financeiro/', {'cursor': cursor}, secure=True)
+            self.assertEqual(response.status_code, 400, cursor)
+
+
+class ListarFuncionariosTests(TestCase):
+    def setUp(self):
+        users = [criar_usuario(f'func{indice}') for indice in range(3)]
+        for user in users:
+            Funcionarios.objects.create(user=user, situacao='ATIVO')
+        self.client = autenticar(users[0])
+
+    def test_paginacao_usa_o_mesmo_cursor_das_demais_listas(self):
+        response = self.client.get('/api/funcionarios/buscar_usuarios_ativos/', {'paginacao': 'cursor', 'limit': 2}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(response.data['next'], secure=True)
+        self.assertEqual([funcionario['username'] for funcionario in response.data['results']], ['func2'])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get('/api/funcionarios/buscar_usuarios_ativos/', {'cursor': 'invalido'}, secure=True)
+        self.assertEqual(response.status_code, 400)
+
+
+class LoginPerfilTests(TestCase):
+    def test_perfil_do_token_sem_dados_pessoais(self):
+        user = criar_usuario('perfil', email='perfil@example.com')
+        user.groups.add(Group.objects.create(name='RH_OPERACAO'))
+        Funcionarios.objects.create(user=user, rg='1234567', cpf='12345678901', situacao='ATIVO')
+
+        client = APIClient()
+        client.cookies['access_token'] = str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+        do_token = client.get('/api/user/login/', secure=True)
+        do_banco = client.get('/api/user/login/', {'completo': 'true'}, secure=True)
+
+        self.assertEqual(do_token.status_code, 200)
+        # O token traz só os campos de exibição, com os mesmos valores do banco
+        self.assertEqual(do_token.data, {campo: do_banco.data[campo] for campo in do_token.data})
+        self.assertIsInstance(do_token.data['id'], int)
+        self.assertEqual(do_token.data['groups'], ['RH_OPERACAO'])
+        self.assertEqual(do_banco.data['cpf'], '12345678901')
+
+        payload = CustomTokenObtainPairSerializer.get_token(user).access_token.payload
+        for campo in ('cpf', 'rg', 'telefone_celular', 'email', 'is_superuser', 'date_joined'):
+            self.assertNotIn(campo, payload)
+
+
+class ImportacaoFuncionariosTests(TestCase):
+    def test_arquivo_vazio_ou_malformado_gera_value_error(self):
+        for conteudo, nome in ((b'', 'funcionarios.csv'), (b'  \n', 'funcionarios.csv'),
+                               (b'[1, 2]', 'funcionarios.json'), (b'{"funcionarios": "x"}', 'funcionarios.json')):
+            with self.assertRaises(ValueError):
+                importacao_funcionarios.ler_arquivo(conteudo, nome)
+
+    def test_linha_que_nao_e_objeto_vira_erro_da_linha(self):
+        results = importacao_funcionarios.importar_funcionarios(['texto'])
+        self.assertEqual(results[0]['code'], 400)
+
+    def test_usuario_criado_em_paralelo_e_reportado_na_linha(self):
+        gravar = importacao_funcionarios.gravar_funcionarios
+
+        def gravar_com_corrida(novas, users):
+            # Simula outro cadastro gravando o mesmo usuário depois da verificação
+            if not User.objects.filter(username='corrida').exists():
+                User.objects.create_user(username='corrida', email='outro@example.com')
+            return gravar(novas, users)
+
+        linhas = [
+            {'username': 'corrida', 'email': 'corrida@example.com', 'password': SENHA},
+            {'username': 'livre', 'email': 'livre@example.com', 'password': SENHA},
+        ]
+        with mock.patch.object(importacao_funcionarios, 'gravar_funcionarios', side_effect=gravar_com_corrida):
+            results = importacao_funcionarios.importar_funcionarios(linhas)
+
+        self.assertEqual([result['code'] for result in results], [400, 201])
+        self.assertTrue(User.objects.filter(username='livre', funcionarios__isnull=False).exists())
+
+
+class BuscaClientesListTests(TestCase):
+    def test_search_na_listagem_mantem_a_ordem_do_ranking(self):
+        ClientesFinanceiro.objects.create(nome_razao_social='Aaa Servicos', nome_fantasia='Zeta', regiao='SP')
+        ClientesFinanceiro.objects.create(nome_razao_social='Zeta Ltda', regiao='SP')
+        ClientesFinanceiro.objects.create(nome_razao_social='Outro', regiao='SP')
+        client = autenticar(criar_usuario('busca'))
+
+        response = client.get('/api/clientes_financeiro/', {'search': 'zeta'}, secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([cliente['nome_razao_social'] for cliente in response.data], ['Zeta Ltda', 'Aaa Servicos'])
+
+    def test_reindexacao_com_falha_preserva_o_indice(self):
+        ClientesFinanceiro.objects.create(nome_razao_social='Alfa Ltda', regiao='SP')
+        ClientesFinanceiro.objects.create(nome_razao_social='Beta Ltda', regiao='SP')
+        antes = ClientesFinanceiroBusca.objects.count()
+        self.assertGreater(antes, 0)
+
+        termos_cliente = busca_clientes.termos_cliente
+        with mock.patch.object(busca_clientes, 'termos_cliente', side_effect=[termos_cliente(ClientesFinanceiro.objects.first()), RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                busca_clientes.reindexar_clientes(batch_size=1)
+
+        self.assertEqual(ClientesFinanceiroBusca.objects.count(), antes)
+        self.assertEqual(busca_clientes.reindexar_clientes(), 2)
+        self.assertEqual(ClientesFinanceiroBusca.objects.count(), antes)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_pool_separado_por_parametros_de_conexao(self):
+        opcoes = {'min_size': 0}
+        pool_a = get_pool('teste_pool', {'host': 'a', 'database': 'human', 'conv': {1: int}}, object, opcoes)
+        pool_b = get_pool('teste_pool', {'host': 'b', 'database': 'human', 'conv': {1: int}}, object, opcoes)
+
+        self.assertIsNot(pool_a, pool_b)
+        self.assertIs(get_pool('teste_pool', {'conv': {1: int}, 'database': 'human', 'host': 'a'}, object, opcoes), pool_a)
+        self.assertIn('teste_pool@a/human', pool_stats())
+
+    def test_espera_contada_uma_vez_por_checkout(self):
+
+        class Conexao:
+            def close(self):
+                pass
+
+        pool = ConnectionPool(Conexao, min_size=0, max_size=1, timeout=0.5)
+        pool.checkout()
+
+        def acordar():
+            # Notificações sem conexão livre fazem o checkout dar várias voltas
+            for _ in range(3):
+                time.sleep(0.05)
+                with pool._cond:
+                    pool._cond.notify_all()
+
+        thread = threading.Thread(target=acordar)
+        thread.start()
+        with self.assertRaises(PoolTimeout):
+            pool.checkout()
+        thread.join()
+
+        self.assertEqual(pool.stats()['waits'], 1)
+        self.assertEqual(pool.stats()['wait_timeouts'], 1)
+
+
+class AwsParametersTests(SimpleTestCase):
+    def test_env_so_le_variaveis_com_prefixo(self):
+        with mock.patch.dict(os.environ, {'HUMAN_PARAM_DB_NAME': 'human', 'HUMAN_PARAM_DB_HOST': '', 'PATH': '/usr/bin'}):
+            parametros = aws_parameters._load_env()
+
+        self.assertEqual(parametros.get('/human/DB_NAME'), 'human')
+        self.assertNotIn('/human/DB_HOST', parametros)
+        self.assertNotIn('/human/PATH', parametros)
+
+    def test_cache_em_disco_so_aceito_com_permissao_0600(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, 'human', 'parameters_cache.json')
+            with mock.patch.object(aws_parameters, 'CACHE_FILE', arquivo):
+                aws_parameters._write_disk_cache({'/human/DB_NAME': 'human'})
+                self.assertEqual(os.stat(os.path.dirname(arquivo)).st_mode & 0o777, 0o700)
+                self.assertEqual(aws_parameters._read_disk_cache(None), {'/human/DB_NAME': 'human'})
+
+                # Um arquivo legível por outros usuários pode ter sido plantado: é ignorado
+                os.chmod(arquivo, 0o644)
+                self.assertIsNone(aws_parameters._read_disk_cache(None))
+
+
+class RevocationListTests(TestCase):
+    def test_revogacao_com_commit_atrasado_e_vista_na_proxima_sincronizacao(self):
+        expira = timezone.now() + timedelta(hours=1)
+        revocation_list = RevocationList(sync_overlap=60)
+        nova = RevokedTokens.objects.create(id=100, jti='nova', token_type='access', expires_at=expira)
+        revocation_list.sync()
+
+        # Linha de outro worker com id e created_at menores, visível só depois do commit
+        RevokedTokens.objects.create(id=50, jti='atrasada', token_type='access', expires_at=expira)
+        RevokedTokens.objects.filter(jti='atrasada').update(created_at=nova.created_at - timedelta(seconds=5))
+        revocation_list.sync()
+
+        self.assertTrue(revocation_list.is_revoked('nova'))
+        self.assertTrue(revocation_list.is_revoked('atrasada'))
+
+
+class ConditionalGetTests(TestCase):
+    def test_etag_do_cliente_so_muda_com_o_proprio_cliente(self):
+        cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente A', regiao='SP')
+        outro = ClientesFinanceiro.objects.create(nome_razao_social='Cliente B', regiao='SP')
+        client = autenticar(criar_usuario('etag'))
+        url = f'/api/clientes_financeiro/{cliente.id}/'
+
+        etag = client.get(url, secure=True)['ETag']
+        outro.nome_fantasia = 'Outro nome'
+        outro.save()
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 304)
+
+        cliente.nome_fantasia = 'Novo nome'
+        cliente.save()
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 200)
+
+
+class ReembolsosTests(TestCase):
+    def test_lista_simples_por_padrao_e_envelope_so_quando_pedido(self):
+        cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente Reembolso', regiao='SP')
+        ClientesFinanceiroReembolsos.objects.create(cliente=cliente, valor=10, mes=1, ano=2026)
+        ClientesFinanceiroReembolsos.objects.create(cliente=cliente, valor=20, mes=1, ano=2025)
+        client = autenticar(criar_usuario('reembolso'))
+        url = '/api/financeiro_valores/reembolsos/'
+
+        # Sem ?ano= o filtro por mes continua valendo para todos os anos
+        response = client.get(url, {'mes': 1}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 2)
+
+        paginada = client.get(url, {'mes': 1, 'limit': 10}, secure=True)
+        self.assertEqual(set(paginada.data), {'count', 'next', 'previous', 'results'})
+        self.assertEqual(paginada.data['count'], 2)
+
+        com_totais = client.get(url, {'ano': 2025, 'totais': 'periodo'}, secure=True)
+        self.assertEqual(set(com_totais.data), {'count', 'next', 'previous', 'results', 'totais'})
+        self.assertEqual(com_totais.data['count'], 1)
+
+        self.assertEqual(client.get(url, {'mes': 'x'}, secure=True).status_code, 400)
+        self.assertEqual(client.get(url, {'cliente_id': 'abc'}, secure=True).status_code, 400)
+
+
+class ResumoValesSSTTests(TestCase):
+    def test_update_em_lote_atualiza_o_resumo(self):
+        cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente Vales', regiao='SP')
+        ClientesFinanceiroValores.objects.create(cliente=cliente, ano=2026, mes=3, vale_transporte=10)
+
+        ClientesFinanceiroValores.objects.filter(cliente=cliente).update(vale_transporte=25)
+        self.assertEqual(ClientesFinanceiroValesSST.objects.get(cliente=cliente, ano=2026, mes=3).vale_transporte, 25)
+
+        ClientesFinanceiroValores.objects.filter(cliente=cliente).update(mes=4)
+        self.assertFalse(ClientesFinanceiroValesSST.objects.filter(cliente=cliente, ano=2026, mes=3).exists())
+        self.assertEqual(ClientesFinanceiroValesSST.objects.get(cliente=cliente, ano=2026, mes=4).vale_transporte, 25)
+
+
+class AutocompleteIndexTests(TransactionTestCase):
+    def test_indice_expirado_responde_na_hora_e_reconstroi_em_segundo_plano(self):
+        ClientesFinanceiro.objects.create(nome_razao_social='Comercial Silva', regiao='SP')
+        indice = AutocompleteIndex(ttl=60)
+        self.assertEqual(len(indice.buscar('silva')), 1)
+
+        ClientesFinanceiro.objects.create(nome_razao_social='Silva Novo', regiao='SP')
+        indice._built_at -= 120
+        # A consulta usa o índice atual e agenda a reconstrução
+        self.assertEqual(len(indice.buscar('silva')), 1)
+        indice._thread.join()
+        self.assertEqual(len(indice.buscar('silva')), 2)
+
+
+class UserProjecaoTests(TestCase):
+    def test_listagem_sem_n_mais_1_e_com_a_mesma_saida(self):
+        grupo = Group.objects.create(name='RH')
+        for indice in range(5):
+            criar_usuario(f'usuario{indice}').groups.add(grupo)
+        client = autenticar(User.objects.get(username='usuario0'))
+
+        with self.assertNumQueries(3):
+            response = client.get('/api/user/', secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, UserSerializer(User.objects.order_by('id'), many=True).data)
+        detalhe = client.get(f"/api/user/{response.data[0]['id']}/", secure=True)
+        self.assertEqual(detalhe.data, response.data[0])
+
+
+class ParameterCacheTests(SimpleTestCase):
+    def test_valor_antigo_servido_enquanto_recarrega_e_mantido_se_falhar(self):
+        cargas = []
+
+        def loader(allow_fallback):
+            cargas.append(allow_fallback)
+            if len(cargas) == 3:
+                raise RuntimeError('Parameter Store indisponível')
+            return {'/human/VALOR': str(len(cargas))}
+
+        cache = ParameterCache(loader, ttl=60)
+        self.assertEqual(cache.get('/human/VALOR'), '1')
+        self.assertEqual(cache.get('/human/VALOR'), '1')
+        self.assertEqual(len(cargas), 1)
+
+        for esperado in ('1', '2'):
+            # TTL vencido: devolve o valor atual e recarrega em segundo plano
+            cache._loaded_at -= 120
+            self.assertEqual(cache.get('/human/VALOR'), esperado)
+            while cache.stats()['refreshing']:
+                time.sleep(0.01)
+        self.assertEqual(cache.get('/human/VALOR'), '2')
+        self.assertEqual(cache.stats()['refresh_errors'], 1)
+
+
+class AsyncQueueHandlerTests(SimpleTestCase):
+    def _handler(self, diretorio, queue_size=100):
+        handler = AsyncQueueHandler(filename=os.path.join(diretorio, 'app.log'), console=False, queue_size=queue_size)
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    def test_registro_gravado_como_json_pela_thread_de_escrita(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            handler = self._handler(diretorio)
+            logger = logging.getLogger('human_app.tests.async')
+            logger.addHandler(handler)
+            try:
+                logger.warning("Cliente %s atualizado", 7, extra={'request_id': 'abc'})
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+            with open(os.path.join(diretorio, 'app.log'), encoding='utf-8') as arquivo:
+                registro = json.loads(arquivo.readline())
+
+        self.assertEqual(registro['message'], 'Cliente 7 atualizado')
+        self.assertEqual(registro['level'], 'WARNING')
+        self.assertEqual(registro['request_id'], 'abc')
+
+    def test_fila_cheia_descarta_sem_bloquear(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            handler = self._handler(diretorio, queue_size=1)
+            # Sem a thread de escrita a fila não esvazia
+            handler.listener.stop()
+            handler._stopped = True
+            for _ in range(3):
+                handler.emit(logging.makeLogRecord({'msg': 'teste', 'levelno': logging.INFO, 'levelname': 'INFO'}))
+            handler.close()
+            for target in handler.targets:
+                target.close()
+
+        self.assertEqual(handler.dropped, 2)
+
+
+class PermissoesRobosTests(TestCase):
+    def test_categorias_por_grupo_e_invalidacao_dos_caches(self):
+        Robos.objects.create(nome='robo_rh', categoria='RH')
+        user = criar_usuario('permissoes')
+        user.groups.add(Group.objects.create(name='RH_OPERACAO'))
+
+        self.assertEqual(get_user_groups(user.id), {'RH_OPERACAO'})
+        self.assertEqual(get_categorias_permitidas(get_user_groups(user.id)), {'RH'})
+
+        # Grupo novo e robô novo aparecem sem esperar o TTL dos caches
+        user.groups.add(Group.objects.create(name='ADMIN'))
+        Robos.objects.create(nome='robo_fiscal', categoria='FISCAL')
+        self.assertEqual(get_user_groups(user.id), {'RH_OPERACAO', 'ADMIN'})
+        self.assertEqual(get_categorias_permitidas(get_user_groups(user.id)), {'RH', 'FISCAL'})
+        self.assertEqual(get_categorias_permitidas(get_user_groups(user.id), 'FISCAL'), {'RH', 'FISCAL'})
+
+    def test_endpoint_de_categorias_ordenado(self):
+        for categoria in ('RH', 'FISCAL', 'CONTABIL', None):
+            Robos.objects.create(nome=f'robo_{categoria}', categoria=categoria)
+        client = autenticar(criar_usuario('categorias'))
+
+        response = client.get('/api/robos/categorias/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [None, 'CONTABIL', 'FISCAL', 'RH'])
+
+
+class SessionLoginTests(TestCase):
+    def test_status_do_check_user_e_cookies_com_perfil(self):
+        Funcionarios.objects.create(user=criar_usuario('sessao', email='sessao@example.com'), situacao='ATIVO')
+        criar_usuario('inativo', is_active=False)
+        client = APIClient()
+        url = '/api/session/login/'
+
+        self.assertEqual(client.post(url, {'username': 'ninguem', 'password': 'x'}, secure=True).status_code, 404)
+        self.assertEqual(client.post(url, {'username': 'sessao', 'password': 'errada'}, secure=True).status_code, 403)
+        self.assertEqual(client.post(url, {'username': 'inativo', 'password': SENHA}, secure=True).status_code, 406)
+        self.assertEqual(client.post(url, {'username': 'sessao'}, secure=True).status_code, 400)
+
+        response = client.post(url, {'username': 'sessao', 'password': SENHA}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'sessao')
+        self.assertIn('access_token', response.cookies)
+        self.assertIn('refresh_token', response.cookies)
+        # Os cookies gravados autenticam as chamadas seguintes
+        self.assertEqual(client.get('/api/session/verify/', secure=True).status_code, 200)
+
+
+class PasswordResetPurgeTests(TestCase):
+    def _token(self, user, token, minutos):
+        return PasswordResetTokens.objects.create(user=user, token=token, expires_in=timezone.now() + timedelta(minutes=minutos))
+
+    def test_purge_em_lotes_apaga_so_os_expirados(self):
+        user = criar_usuario('reset')
+        for indice in range(5):
+            self._token(user, f'expirado{indice}', -10)
+        self._token(user, 'valido', 10)
+
+        self.assertEqual(purge_expired_tokens(batch_size=2, max_batches=1), 2)
+        self.assertEqual(purge_expired_tokens(batch_size=2), 3)
+        self.assertEqual(list(PasswordResetTokens.objects.values_list('token', flat=True)), ['valido'])
+
+    def test_limite_de_tokens_por_usuario(self):
+        user = criar_usuario('limite')
+        self._token(user, 'expirado', -10)
+        for indice in range(3):
+            self._token(user, f'valido{indice}', 10)
+
+        enforce_user_token_cap(user, max_tokens=3)
+
+        # Sobram os dois mais novos, abrindo espaço para o token que será criado
+        self.assertEqual(set(PasswordResetTokens.objects.values_list('token', flat=True)), {'valido1', 'valido2'})
+
+
+class AtivacaoLoteTests(TestCase):
+    def setUp(self):
+        self.admin = Group.objects.create(name='ADMIN')
+        self.client = autenticar(criar_usuario('gestor'))
+
+    def test_ativa_em_lote_e_reporta_ids_inexistentes(self):
+        users = []
+        for indice in range(2):
+            user = criar_usuario(f'lote{indice}', is_active=False)
+            Funcionarios.objects.create(user=user)
+            users.append(user)
+        # Grupos já em cache antes da ativação
+        self.assertEqual(get_user_groups(users[0].id), set())
+
+        ids = [user.id for user in users] + [999999]
+        response = self.client.put('/api/funcionarios/activate/lote/', {'ids': ids, 'groups': [self.admin.id]}, format='json', secure=True)
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['code'] for result in response.data], [200, 200, 404])
+        for user in users:
+            user.refresh_from_db()
+            self.assertTrue(user.is_active and user.is_staff)
+            self.assertEqual(user.funcionarios.situacao, 'ATIVO')
+            self.assertEqual(get_user_groups(user.id), {'ADMIN'})
+
+        response = self.client.put('/api/funcionarios/activate/lote/', {'ids': ids, 'groups': [123456]}, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_substituir_grupos_recalcula_is_staff(self):
+        rh = Group.objects.create(name='RH')
+        user = criar_usuario('ex_admin', is_staff=True)
+        user.groups.add(self.admin)
+        url = '/api/funcionarios/groups/lote/'
+
+        # Sem "substituir" os grupos só são somados
+        response = self.client.put(url, {'ids': [user.id], 'groups': [rh.id]}, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.is_staff)
+        self.assertEqual(get_user_groups(user.id), {'ADMIN', 'RH'})
+
+        response = self.client.put(url, {'ids': [user.id], 'groups': [rh.id], 'substituir': True}, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertFalse(user.is_staff)
+        self.assertEqual(get_user_groups(user.id), {'RH'})
+
+        self.client.put(url, {'ids': [user.id], 'groups': [self.admin.id], 'substituir': True}, format='json', secure=True)
+        user.refresh_from_db()
+        self.assertTrue(user.is_staff)
+
+
+class ValoresChaveUnicaTests(TestCase):
+    def test_um_registro_por_cliente_e_mes(self):
+        cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente Valores', regiao='SP')
+
+        linha, criada = upsert_valores(cliente.id, 2026, 5, inss=100.0)
+        self.assertTrue(criada)
+        linha, criada = upsert_valores(cliente.id, 2026, 5, fgts=50.0)
+        self.assertFalse(criada)
+        # Só os campos enviados são sobrescritos
+        self.assertEqual((linha.inss, linha.fgts), (100.0, 50.0))
+        self.assertEqual(ClientesFinanceiroValores.objects.filter(cliente=cliente).count(), 1)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ClientesFinanceiroValores.objects.create(cliente=cliente, ano=2026, mes=5)
+
+
+class ValoresLoteTests(TestCase):
+    def setUp(self):
+        self.cliente = ClientesFinanceiro.objects.create(nome_razao_social='Cliente Lote', cnpj='12.345.678/0001-90', regiao='SP')
+        self.client = autenticar(criar_usuario('valores'))
+
+    def test_upsert_em_lote_com_resultado_por_linha(self):
+        ClientesFinanceiroValores.objects.create(cliente=self.cliente, ano=2026, mes=6, inss=1.0, fgts=2.0)
+        dados = {'ano': 2026, 'mes': 6, 'valores': [
+            {'cliente_id': self.cliente.id, 'inss': 10.0},
+            {'nome_razao_social': '12345678000190', 'ano': 2026, 'mes': 7, 'fgts': 3.0},
+            {'nome_razao_social': 'Cliente Inexistente', 'inss': 1.0},
+            {'cliente_id': self.cliente.id, 'mes': 13},
+        ]}
+
+        response = self.client.post('/api/financeiro_valores/lote/', dados, format='json', secure=True)
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['code'] for result in response.data], [200, 200, 404, 400])
+        junho = ClientesFinanceiroValores.objects.get(cliente=self.cliente, ano=2026, mes=6)
+        self.assertEqual((junho.inss, junho.fgts), (10.0, 2.0))
+        self.assertEqual(ClientesFinanceiroValores.objects.get(cliente=self.cliente, ano=2026, mes=7).fgts, 3.0)
+
+
+class ValesSSTLoteTests(TestCase):
+    def setUp(self):
+        self.clientes = [ClientesFinanceiro.objects.create(nome_razao_social=f'Cliente Grade {indice}', regiao='SP') for indice in range(2)]
+        self.client = autenticar(criar_usuario('grade'))
+
+    def test_grade_do_mes_gravada_em_lote_e_lida_do_resumo(self):
+        dados = {'ano': 2026, 'mes': 8, 'valores': [
+            {'nome_razao_social': 'Cliente Grade 0', 'vale_transporte': 100.0, 'vale_refeicao': 50.0},
+            {'cliente_id': self.clientes[1].id, 'saude_seguranca_trabalho': 30.0},
+        ]}
+
+        response = self.client.put('/api/financeiro_valores/vales_sst/lote/', dados, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+
+        grade = self.client.get('/api/financeiro_valores/vales_sst/', {'ano': 2026, 'mes': 8, 'limit': 10}, secure=True).data['results']
+        por_nome = {linha['nome_razao_social']: linha for linha in grade}
+        self.assertEqual(por_nome['Cliente Grade 0']['vale_transporte'], 100.0)
+        self.assertEqual(por_nome['Cliente Grade 0']['vale_refeicao'], 50.0)
+        self.assertEqual(por_nome['Cliente Grade 1']['saude_seguranca_trabalho'], 30.0)
+        self.assertEqual(por_nome['Cliente Grade 1']['vale_transporte'], 0.0)
+
+
+class FolhasPontoLoteTests(TestCase):
+    def setUp(self):
+        self.client = autenticar(criar_usuario('folha'))
+
+    def test_numero_de_consultas_nao_cresce_com_o_lote(self):
+        clientes = [ClientesFinanceiro.objects.create(nome_razao_social=f'Cliente Folha {indice}', regiao='SP') for indice in range(8)]
+        url = '/api/clientes_financeiro/folha_ponto/criar/'
+
+        consultas = []
+        for lote in (clientes[:2], clientes[2:8]):
+            with CaptureQueriesContext(connection) as contexto:
+                response = self.client.post(url, {'id_clientes': [cliente.id for cliente in lote]}, format='json', secure=True)
+            self.assertEqual(response.status_code, 200)
+            consultas.append(len(contexto.captured_queries))
+        self.assertEqual(consultas[0], consultas[1])
+
+        response = self.client.post(url, {'id_clientes': [clientes[0].id, 'x', 999999]}, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ClientesFinanceiroFolhaPonto.objects.count(), 8)
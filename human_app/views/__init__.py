@@ -5,6 +5,7 @@ from .clientes_financeiro_views import *
 from .dashboard_views import *
 from .robos_views import *
 from .gdrive_views import *
+from .metricas_views import *
 import logging
 
 logger = logging.getLogger('django')  # Usando o logger configurado para o Django
\ No newline at end of file
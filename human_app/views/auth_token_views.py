@@ -1,8 +1,9 @@
 from rest_framework import status
 from rest_framework.views import APIView, Response
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from django.http import JsonResponse
@@ -10,6 +11,38 @@ from django.conf import settings
 from human_app.models import User
 from ..serializers.user_serial import *
 from django.contrib.auth.hashers import check_password
+from django.contrib.auth.models import update_last_login
+from human_app.services.token_claims import add_profile_claims, profile_from_token
+from human_app.services.token_revocation import is_token_revoked, revoke_tokens
+import logging
+
+logger = logging.getLogger('human_app')
+
+
+def set_auth_cookies(response, access_token, refresh_token=None):
+    # Configurar o cookie para o token de acesso
+    response.set_cookie(
+        key='access_token',
+        value=str(access_token),
+        max_age=settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds(),
+        httponly=True,
+        samesite='Lax',
+        path='/',
+        secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],  # True em produção
+    )
+
+    # Configurar o cookie para o token de refresh
+    if refresh_token is not None:
+        response.set_cookie(
+            key='refresh_token',
+            value=str(refresh_token),
+            max_age=settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds(),
+            httponly=True,
+            samesite='Lax',
+            path='/',
+            secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],  # True em produção
+        )
+    return response
 
 class CheckUser(APIView):
     serializer = UserSerializer
@@ -28,7 +61,40 @@ class CheckUser(APIView):
         except User.DoesNotExist:
             return Response({"Usuário inexistente"}, status=status.HTTP_404_NOT_FOUND)
 
+class SessionLogin(APIView):
+    # Login em uma única chamada: valida a senha uma vez, grava os cookies e devolve o perfil.
+    # Mantém os mesmos status do CheckUser (404 inexistente, 403 inválido, 406 inativo).
+    authentication_classes = []
+
+    def post(self, request):
+        username = request.data.get('username')
+        password = request.data.get('password')
+        if not username or not password:
+            return Response({"Usuário e senha obrigatórios"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            return Response({"Usuário inexistente"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            if not user.check_password(password):
+                return Response({"Usuário inválido"}, status=status.HTTP_403_FORBIDDEN)
+            if not user.is_active:
+                return Response({"Usuário inativo"}, status=status.HTTP_406_NOT_ACCEPTABLE)
+
+            # last_login é gravado antes para que a claim já traga este login
+            if api_settings.UPDATE_LAST_LOGIN:
+                update_last_login(None, user)
+            refresh_token = CustomTokenObtainPairSerializer.get_token(user)
+            access_token = refresh_token.access_token
+
+            response = Response(profile_from_token(access_token), status=status.HTTP_200_OK)
+            return set_auth_cookies(response, access_token, refresh_token)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 class CustomTokenObtainPairView(TokenObtainPairView):
+    serializer_class = CustomTokenObtainPairSerializer
+
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         try:
@@ -36,27 +102,7 @@ class CustomTokenObtainPairView(TokenObtainPairView):
                 access_token = response.data.get('access')
                 refresh_token = response.data.get('refresh')
 
-                # Configurar o cookie para o token de acesso
-                response.set_cookie(
-                    key='access_token',
-                    value=access_token,
-                    max_age=settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds(),
-                    httponly=True,
-                    samesite='Lax',
-                    path='/',
-                    secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],  # True em produção
-                )
-
-                # Configurar o cookie para o token de refresh
-                response.set_cookie(
-                    key='refresh_token',
-                    value=refresh_token,
-                    max_age=settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds(),
-                    httponly=True,
-                    samesite='Lax',
-                    path='/',
-                    secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],  # True em produção
-                )
+                set_auth_cookies(response, access_token, refresh_token)
 
                 # Remove os tokens do corpo da resposta
                 del response.data['refresh']
@@ -77,24 +123,49 @@ class SessionRenewToken(APIView):
             try:
                 # Cria um novo token de acesso usando o token de refresh
                 valid_refresh_token = RefreshToken(refresh_token)
+                if is_token_revoked(valid_refresh_token):
+                    return Response({"Error": "Refresh Token inválido"}, status=status.HTTP_401_UNAUTHORIZED)
+                # Atualiza as claims de perfil com os dados atuais do usuário
+                user = User.objects.filter(id=valid_refresh_token[api_settings.USER_ID_CLAIM], is_active=True).first()
+                if not user:
+                    return Response({"Error": "Usuário inválido"}, status=status.HTTP_401_UNAUTHORIZED)
+
+                new_refresh_token = None
+                if api_settings.ROTATE_REFRESH_TOKENS:
+                    # Revoga o refresh atual antes de trocar o jti
+                    revoke_tokens(valid_refresh_token)
+                    valid_refresh_token.set_jti()
+                    valid_refresh_token.set_exp()
+                    valid_refresh_token.set_iat()
+                    new_refresh_token = valid_refresh_token
+                add_profile_claims(valid_refresh_token, user)
                 new_access_token = valid_refresh_token.access_token
+
                 response = Response({"Token": "Renovado"}, status=status.HTTP_200_OK)
-                response.set_cookie(
-                    key='access_token',
-                    value=str(new_access_token),
-                    max_age=settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds(),
-                    httponly=True,
-                    samesite='Lax',
-                    path='/',
-                    secure=settings.SIMPLE_JWT['AUTH_COOKIE_SECURE'],  # True em produção
-                )
-                return response
+                return set_auth_cookies(response, new_access_token, new_refresh_token)
             except TokenError as e:
                 return Response({"Error": "Refresh Token inválido"}, status=status.HTTP_401_UNAUTHORIZED)
         return Response({"Error": "Não há Refresh Token"}, status=status.HTTP_404_NOT_FOUND)
 
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
 class SessionLogout(APIView):
     def post(self, request):
+        # Revoga os tokens da sessão para que não possam ser usados até expirarem
+        tokens = []
+        for cookie, token_class in (('access_token', AccessToken), ('refresh_token', RefreshToken)):
+            raw_token = request.COOKIES.get(cookie)
+            if raw_token:
+                try:
+                    tokens.append(token_class(raw_token))
+                except TokenError:
+                    pass
+        try:
+            revoke_tokens(*tokens)
+        except Exception as error:
+            logger.error("Erro ao revogar tokens no logout: %s", error)
+
         response = JsonResponse({"detail": "Logout realizado com sucesso."}, status=status.HTTP_204_NO_CONTENT)
         response.delete_cookie('access_token')
         response.delete_cookie('refresh_token')
@@ -3,12 +3,48 @@ from rest_framework.views import Response
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.filters import SearchFilter
-from django.db.models import Case, When, Sum, Value, FloatField
-from django.db.models.functions import Coalesce
-from human_app.models import ClientesFinanceiro, ClientesFinanceiroReembolsos
+from django.db import transaction
+from django.db.models import F, Q, Sum, Count, Value, FloatField, IntegerField, FilteredRelation, Case, When
+from django.db.models.functions import Coalesce, Round
+from human_app.models import ClientesFinanceiro, ClientesFinanceiroValores, ClientesFinanceiroReembolsos
+from human_app.services.busca_clientes import buscar_clientes
+from human_app.services.autocomplete_clientes import autocomplete_index
+from human_app.services.clientes_resolver import resolver_cliente, resolver_cliente_id, resolver_clientes_ids
+from human_app.services.valores_financeiro import CAMPOS_VALORES, CAMPOS_VALES_SST, upsert_valores, bulk_upsert_valores
+from human_app.pagination import KeysetPagination, usar_cursor
+from rest_framework.exceptions import ValidationError
 from ..serializers.clientes_financeiro_serial import *
 import json
+from .multi_status import multi_status_response
+from .conditional import conditional_get
+
+
+# Validadores do conditional_get restritos às linhas que cada resposta usa, para que
+# uma alteração em outro cliente não invalide o cache do navegador
+def clientes_filtrados(request):
+    is_active = request.query_params.get('is_active')
+    if is_active is None:
+        return ClientesFinanceiro.objects.all()
+    return ClientesFinanceiro.objects.filter(is_active=is_active == 'true')
+
+
+def dados_clientes(self, request, *args, **kwargs):
+    return [clientes_filtrados(request)]
+
+
+def dados_cliente(self, request, pk=None, *args, **kwargs):
+    return [ClientesFinanceiro.objects.filter(pk=pk)]
+
+
+def dados_folha_ponto(self, request, *args, **kwargs):
+    return [
+        ClientesFinanceiro.objects.filter(is_active=True),
+        ClientesFinanceiroFolhaPonto.objects.filter(cliente__is_active=True),
+    ]
+
+
+def dados_folha_ponto_cliente(self, request, pk=None, *args, **kwargs):
+    return [ClientesFinanceiro.objects.filter(pk=pk), ClientesFinanceiroFolhaPonto.objects.filter(cliente_id=pk)]
 
 
 @permission_classes([IsAuthenticated])
@@ -16,8 +52,6 @@ class ClientesFinanceiroViewset(viewsets.ModelViewSet):
     queryset = ClientesFinanceiro.objects.all()    
     serializer_class = ClientesFinanceiroSerializer
     pagination_class = LimitOffsetPagination
-    filter_backends = [SearchFilter]
-    search_fields = ['nome_razao_social']
 
     def create(self, request, *args, **kwargs):
         try:
@@ -31,20 +65,77 @@ class ClientesFinanceiroViewset(viewsets.ModelViewSet):
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @conditional_get(dados_clientes)
     def list(self, request, *args, **kwargs):
         try:
-            is_active = request.query_params.get('is_active')
-            if is_active is None:
-                queryset = ClientesFinanceiro.objects.all().order_by('nome_razao_social')
-            else:
-                is_active = True if is_active == 'true' else False
-                queryset = ClientesFinanceiro.objects.filter(is_active=is_active).order_by('nome_razao_social')
+            queryset = clientes_filtrados(request).order_by('nome_razao_social')
+            search = request.query_params.get('search')
+            if search:
+                # Filtra pelo índice de busca (sem acento, por prefixo) em vez de LIKE '%...%',
+                # só entre os clientes já filtrados, mantendo a ordem do ranking
+                ids = [cliente_id for cliente_id, _ in buscar_clientes(search, queryset)]
+                queryset = queryset.filter(id__in=ids).order_by(Case(
+                    *[When(id=cliente_id, then=Value(posicao)) for posicao, cliente_id in enumerate(ids)],
+                    output_field=IntegerField(),
+                ))
+            if usar_cursor(request):
+                # O cursor exige a ordem por (nome_razao_social, id)
+                paginator = KeysetPagination(ordering=('nome_razao_social', 'id'))
+                page = paginator.paginate_queryset(queryset, request, view=self)
+                serializer = ClientesFinanceiroSerializer(page, many=True)
+                return paginator.get_paginated_response(serializer.data)
             page = self.paginate_queryset(queryset)
             if page is not None:
                 serializer = ClientesFinanceiroSerializer(page, many=True)
                 return self.get_paginated_response(serializer.data)
             serializer = ClientesFinanceiroSerializer(queryset, many=True)
             return Response(serializer.data)
+        except ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @conditional_get(dados_cliente)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='buscar')
+    @conditional_get(dados_clientes)
+    def buscar(self, request):
+        # Busca ranqueada por razão social, fantasia, CNPJ, CPF e email, ignorando acentos
+        try:
+            consulta = request.query_params.get('q', '').strip()
+            if not consulta:
+                return Response({"error": "O parâmetro 'q' é obrigatório"}, status=status.HTTP_400_BAD_REQUEST)
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+
+            clientes = None
+            if request.query_params.get('is_active') is not None:
+                clientes = clientes_filtrados(request)
+
+            ranking = buscar_clientes(consulta, clientes, limit)
+            clientes_por_id = ClientesFinanceiro.objects.in_bulk([cliente_id for cliente_id, _ in ranking])
+            data = []
+            for cliente_id, pontuacao in ranking:
+                if cliente_id in clientes_por_id:
+                    cliente_data = ClientesFinanceiroSerializer(clientes_por_id[cliente_id]).data
+                    cliente_data['pontuacao'] = pontuacao
+                    data.append(cliente_data)
+            return Response(data, status=status.HTTP_200_OK)
+        except ValueError:
+            return Response({"error": "O parâmetro 'limit' é inválido"}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        # Sugestões de nomes de clientes ativos enquanto o usuário digita, servidas da memória
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+            clientes = autocomplete_index.buscar(request.query_params.get('q', ''), limit)
+            return Response(clientes, status=status.HTTP_200_OK)
+        except ValueError:
+            return Response({"error": "O parâmetro 'limit' é inválido"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -111,10 +202,18 @@ class ClientesFinanceiroViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
     @action(detail=False, methods=['get'], url_path='folha_ponto')
+    @conditional_get(dados_folha_ponto)
     def listar_folha_ponto(self, request):
         try:
-            folha_ponto = ClientesFinanceiroFolhaPonto.objects.filter(cliente__is_active=True).order_by('cliente__nome_razao_social')
-            
+            folha_ponto = ClientesFinanceiroFolhaPonto.objects.filter(cliente__is_active=True).select_related('cliente').order_by('cliente__nome_razao_social')
+
+            if usar_cursor(request):
+                # Ordena pelo índice local (cliente_id, id); o nome do cliente está em outra tabela
+                paginator = KeysetPagination(ordering=('cliente_id', 'id'))
+                page = paginator.paginate_queryset(folha_ponto, request, view=self)
+                serializer = ClienteFinanceiroFolhaPontoSerializer(page, many=True)
+                return paginator.get_paginated_response(serializer.data)
+
             page = self.paginate_queryset(folha_ponto)
 
             if page is not None:
@@ -123,10 +222,13 @@ class ClientesFinanceiroViewset(viewsets.ModelViewSet):
 
             serializer = ClienteFinanceiroFolhaPontoSerializer(folha_ponto, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
+        except ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=True, methods=['get'], url_path='folha_ponto')
+    @conditional_get(dados_folha_ponto_cliente)
     def folha_ponto(self, request, pk=None):
         try:
             folha_ponto = ClientesFinanceiroFolhaPonto.objects.filter(cliente_id=pk, cliente__is_active=True).order_by('cliente__nome_razao_social')
@@ -141,45 +243,54 @@ class ClientesFinanceiroViewset(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['post'], url_path='folha_ponto/criar')
     def create_folhas_ponto(self, request):
+        # Número fixo de consultas para qualquer quantidade de ids: clientes válidos,
+        # folhas já existentes, um bulk_create e a releitura das folhas criadas
         try:
             ids = request.data.get('id_clientes')
-            results = []
-            success = 0
-            errors = 0
 
             if not ids:
                 return Response({"error": "O campo 'clientes' é obrigatório"}, status=status.HTTP_400_BAD_REQUEST)
 
+            ids_validos = set()
             for id in ids:
-                data = {
-                    'cliente_id': id,
-                    'registrado': False,
-                    'colaborador:': False
-                }
+                try:
+                    ids_validos.add(int(id))
+                except (TypeError, ValueError):
+                    pass
+            clientes = set(ClientesFinanceiro.objects.filter(id__in=ids_validos).values_list('id', flat=True))
+            existentes = set(ClientesFinanceiroFolhaPonto.objects.filter(cliente_id__in=clientes).values_list('cliente_id', flat=True))
 
-                if ClientesFinanceiroFolhaPonto.objects.filter(cliente=id).exists():
-                    results.append({"status": "error", "code": 400, "id": int(id), "error": "O cliente selecionado possui um registo de folha de ponto criada!"})
+            results = []
+            criar = []
+            for id in ids:
+                try:
+                    id = int(id)
+                except (TypeError, ValueError):
+                    results.append({"status": "error", "code": 400, "id": id, "error": "Id de cliente inválido"})
                     continue
-
-                folha_ponto_serializer = ClienteFinanceiroFolhaPontoSerializer(data=data)
-                if folha_ponto_serializer.is_valid():
-                    folha_ponto_serializer.save()
-                    results.append({"status": "success", "code": 200, "id": int(id), "data": folha_ponto_serializer.data})
-                    success += 1
-                else:
-                    results.append({"status": "error", "code": 400, "id": int(id), "error": folha_ponto_serializer.errors})
-                    errors += 1
-            
-            if not results:
-                return Response({"error": "Nenhum cliente foi encontrado"}, status=status.HTTP_404_NOT_FOUND)
-            
-            if errors > 0 and success > 0:
-                return Response(results, status=status.HTTP_207_MULTI_STATUS)
-            
-            if errors > 0 and success == 0:
-                return Response(results, status=status.HTTP_400_BAD_REQUEST)
-
-            return Response(results, status=status.HTTP_200_OK)
+                if id not in clientes:
+                    results.append({"status": "error", "code": 400, "id": id, "error": "Cliente não encontrado"})
+                    continue
+                if id in existentes:
+                    results.append({"status": "error", "code": 400, "id": id, "error": "O cliente selecionado possui um registo de folha de ponto criada!"})
+                    continue
+                existentes.add(id)
+                criar.append(id)
+                results.append({"status": "success", "code": 200, "id": id})
+
+            if criar:
+                with transaction.atomic():
+                    ClientesFinanceiroFolhaPonto.objects.bulk_create(
+                        [ClientesFinanceiroFolhaPonto(cliente_id=id, registrado=False, colaborador=False) for id in criar]
+                    )
+                # O MySQL não devolve os ids do bulk_create: relê as folhas criadas, já com o cliente
+                folhas = list(ClientesFinanceiroFolhaPonto.objects.filter(cliente_id__in=criar).select_related('cliente'))
+                folhas_data = {folha.cliente_id: data for folha, data in zip(folhas, ClienteFinanceiroFolhaPontoSerializer(folhas, many=True).data)}
+                for result in results:
+                    if result['status'] == 'success':
+                        result['data'] = folhas_data.get(result['id'])
+
+            return multi_status_response(results)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
@@ -248,6 +359,20 @@ class ClientesFinanceiroValoresViewset(viewsets.ModelViewSet):
     serializer_class = ClientesFinanceiroValoresSerializer
     pagination_class = LimitOffsetPagination
 
+    def list(self, request, *args, **kwargs):
+        try:
+            if not usar_cursor(request):
+                return super().list(request, *args, **kwargs)
+            # Mais recentes primeiro; percorre o índice (ano, mes, id) de trás para frente
+            paginator = KeysetPagination(ordering=('-ano', '-mes', '-id'))
+            page = paginator.paginate_queryset(self.filter_queryset(self.get_queryset()), request, view=self)
+            serializer = ClientesFinanceiroValoresSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=True, methods=['get'], url_path='profile')
     def profile(self, request, pk=None):
         try:
@@ -270,33 +395,13 @@ class ClientesFinanceiroValoresViewset(viewsets.ModelViewSet):
             if ano == 'NaN':
                 ano = None
 
+            # Leitura do resumo materializado: um LEFT JOIN pela chave única (cliente, ano, mes)
             clientes = ClientesFinanceiro.objects.annotate(
-                vale_transporte=Coalesce(Sum(Case(
-                    When(valores__mes=mes, valores__ano=ano, then='valores__vale_transporte'),
-                    default=Value(0, output_field=FloatField()),
-                    output_field=FloatField()
-                    )), Value(0, output_field=FloatField())),
-                assinat_eletronica=Coalesce(Sum(Case(
-                    When(valores__mes=mes, valores__ano=ano, then='valores__assinat_eletronica'),
-                    default=Value(0, output_field=FloatField()),
-                    output_field=FloatField()
-                )), Value(0, output_field=FloatField())),
-                vale_refeicao=Coalesce(Sum(Case(
-                    When(valores__mes=mes, valores__ano=ano, then='valores__vale_refeicao'),
-                    default=Value(0, output_field=FloatField()),
-                    output_field=FloatField()
-                )), Value(0, output_field=FloatField())),
-                mensal_ponto_elet=Coalesce(Sum(Case(
-                    When(valores__mes=mes, valores__ano=ano, then='valores__mensal_ponto_elet'),
-                    default=Value(0, output_field=FloatField()),
-                    output_field=FloatField()
-                )), Value(0, output_field=FloatField())),
-                saude_seguranca_trabalho=Coalesce(Sum(Case(
-                    When(valores__mes=mes, valores__ano=ano, then='valores__saude_seguranca_trabalho'),
-                    default=Value(0, output_field=FloatField()),
-                    output_field=FloatField()
-                )), Value(0, output_field=FloatField()))
-            )
+                resumo=FilteredRelation('resumos_vales_sst', condition=Q(resumos_vales_sst__ano=ano, resumos_vales_sst__mes=mes)),
+            ).annotate(**{
+                campo: Coalesce(F(f'resumo__{campo}'), Value(0, output_field=FloatField()))
+                for campo in CAMPOS_VALES_SST
+            }).order_by('nome_razao_social', 'id')
 
             page = self.paginate_queryset(clientes)
             if page is not None:
@@ -337,53 +442,152 @@ class ClientesFinanceiroValoresViewset(viewsets.ModelViewSet):
             if not nome_razao_social:
                 return Response({'nome_razao_social': ['Este campo não pode ser vazio.']}, status=status.HTTP_400_BAD_REQUEST)
 
-            try:
-                cliente = ClientesFinanceiro.objects.get(nome_razao_social=nome_razao_social)
-            except ClientesFinanceiro.DoesNotExist:
+            # Aceita razão social, CNPJ ou CPF
+            cliente = resolver_cliente(nome_razao_social)
+            if cliente is None:
                 return Response({'nome_razao_social': ['Cliente não encontrado.']}, status=status.HTTP_404_NOT_FOUND)
 
-            vale = ClientesFinanceiroValores.objects.filter(
-                mes=mes,
-                ano=ano,
-                cliente=cliente
-            ).first()
+            serializer = ClientesFinanceiroValoresUpsertSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-            if vale:
-                # Vale existe, atualiza-lo
-                serializer = ClientesFinanceiroValoresSerializer(vale, data=data, partial=True)
-                if serializer.is_valid():
-                    serializer.save()
-                    return Response(serializer.data, status=status.HTTP_200_OK)
-                else:
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                # Vale não existe, cria-lo
-                data['cliente'] = cliente.id
-                serializer = ClientesFinanceiroValoresSerializer(data=data)
-                if serializer.is_valid():
-                    serializer.save(cliente=cliente)
-                    return Response(serializer.data, status=status.HTTP_201_CREATED)
-                else:
-                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            # Cria ou atualiza o mês do cliente em um único INSERT ... ON DUPLICATE KEY UPDATE
+            valores = dict(serializer.validated_data)
+            vale, criado = upsert_valores(cliente.id, valores.pop('ano'), valores.pop('mes'), **valores)
+            serializer = ClientesFinanceiroValoresSerializer(vale)
+            return Response(serializer.data, status=status.HTTP_201_CREATED if criado else status.HTTP_200_OK)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 
+    def chave_cliente_lote(self, linha):
+        # Cada linha identifica o cliente por 'cliente_id' ou por 'nome_razao_social' (razão social, CNPJ ou CPF)
+        if linha.get('cliente_id') not in (None, ''):
+            try:
+                return int(linha['cliente_id'])
+            except (TypeError, ValueError):
+                return None
+        valor = str(linha.get('nome_razao_social') or '').strip()
+        return valor or None
+
+    def upsert_valores_lote(self, request, campos):
+        """Valida as linhas em memória e grava todas as válidas em uma transação.
+
+        Os clientes do lote são resolvidos em uma única consulta e as linhas
+        são gravadas com INSERT ... ON DUPLICATE KEY UPDATE, um por conjunto
+        de campos enviados, para não apagar campos que a linha não trouxe.
+        """
+        linhas = request.data.get('valores')
+        if not isinstance(linhas, list) or not linhas:
+            return Response({"error": "O campo 'valores' é obrigatório"}, status=status.HTTP_400_BAD_REQUEST)
+        ano = request.data.get('ano')
+        mes = request.data.get('mes')
+
+        chaves = [self.chave_cliente_lote(linha) if isinstance(linha, dict) else None for linha in linhas]
+        clientes = resolver_clientes_ids([chave for chave in chaves if chave is not None])
+
+        results = []
+        validas = {}
+        for index, (linha, chave) in enumerate(zip(linhas, chaves)):
+            if chave is None:
+                results.append({"status": "error", "code": 400, "index": index, "error": "Informe 'cliente_id' ou 'nome_razao_social'"})
+                continue
+            cliente_id = clientes.get(chave)
+            if cliente_id is None:
+                results.append({"status": "error", "code": 404, "index": index, "cliente": chave, "error": "Cliente não encontrado"})
+                continue
+
+            data = {campo: linha[campo] for campo in campos if campo in linha}
+            data['ano'] = linha.get('ano', ano)
+            data['mes'] = linha.get('mes', mes)
+            serializer = ClientesFinanceiroValoresUpsertSerializer(data=data)
+            if not serializer.is_valid():
+                results.append({"status": "error", "code": 400, "index": index, "cliente_id": cliente_id, "error": serializer.errors})
+                continue
+
+            valores = dict(serializer.validated_data)
+            periodo = (cliente_id, valores.pop('ano'), valores.pop('mes'))
+            if periodo in validas:
+                results.append({"status": "error", "code": 400, "index": index, "cliente_id": cliente_id, "error": "Cliente repetido no lote para o mesmo mês"})
+                continue
+            validas[periodo] = (index, valores)
+
+        grupos = {}
+        for (cliente_id, ano_linha, mes_linha), (index, valores) in validas.items():
+            grupos.setdefault(tuple(sorted(valores)), []).append(
+                ClientesFinanceiroValores(cliente_id=cliente_id, ano=ano_linha, mes=mes_linha, **valores)
+            )
+        with transaction.atomic():
+            for update_fields, objetos in grupos.items():
+                bulk_upsert_valores(objetos, update_fields)
+
+        for (cliente_id, ano_linha, mes_linha), (index, valores) in validas.items():
+            results.append({"status": "success", "code": 200, "index": index, "cliente_id": cliente_id, "ano": ano_linha, "mes": mes_linha})
+        results.sort(key=lambda result: result['index'])
+        return multi_status_response(results)
+
+    @action(detail=False, methods=['post'], url_path='lote')
+    def upsert_lote(self, request):
+        # Cria ou atualiza os valores de um mês para vários clientes: {"ano", "mes", "valores": [...]}
+        try:
+            return self.upsert_valores_lote(request, CAMPOS_VALORES)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['put'], url_path='vales_sst/lote')
+    def update_vales_sst_lote(self, request):
+        # Grade do mês inteiro de uma vez: {"ano", "mes", "valores": [{"nome_razao_social", "vale_transporte", ...}]}
+        try:
+            return self.upsert_valores_lote(request, CAMPOS_VALES_SST)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=False, methods=['get'], url_path='reembolsos')
     def reembolsos(self, request):
+        # Lista simples por padrão; ?limit= (paginação) ou ?totais=cliente|periodo devolvem
+        # o envelope {count, next, previous, results}, com 'totais' só quando pedido
         try:
-            mes = request.query_params.get('mes')
-            ano = request.query_params.get('ano')
-            if mes == 'NaN':
-                mes = None
-            if ano == 'NaN':
-                ano = None
-            reembolsos = ClientesFinanceiroReembolsos.objects.filter(mes=mes).order_by('mes', 'ano')
-            page = self.paginate_queryset(reembolsos)
-            if page is not None:    
-                serializer = ClientesFinanceiroReembolsosSerializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
+            filtros = {}
+            try:
+                for campo in ('ano', 'mes', 'cliente_id'):
+                    valor = request.query_params.get(campo)
+                    if valor not in (None, '', 'NaN'):
+                        filtros[campo] = int(valor)
+            except ValueError:
+                return Response({"error": "Os parâmetros 'ano', 'mes' e 'cliente_id' devem ser números"}, status=status.HTTP_400_BAD_REQUEST)
+
+            totais = request.query_params.get('totais')
+            if totais not in (None, '', 'cliente', 'periodo'):
+                return Response({"error": "O parâmetro 'totais' deve ser 'cliente' ou 'periodo'"}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Filtros pelo índice (ano, mes) e por cliente (?cliente_id= ou ?cliente= razão social, CNPJ ou CPF)
+            reembolsos = ClientesFinanceiroReembolsos.objects.filter(**filtros)
+            cliente = request.query_params.get('cliente')
+            if cliente:
+                reembolsos = reembolsos.filter(cliente_id=resolver_cliente_id(cliente))
+
+            projecao = reembolsos_projecao(reembolsos).order_by('ano', 'mes', 'id')
+            page = self.paginate_queryset(projecao)
+            if page is not None:
+                response = self.get_paginated_response(ClientesFinanceiroReembolsosProjecaoSerializer(page, many=True).data)
+            else:
+                data = ClientesFinanceiroReembolsosProjecaoSerializer(projecao, many=True).data
+                if not totais:
+                    return Response(data, status=status.HTTP_200_OK)
+                response = Response({'count': len(data), 'next': None, 'previous': None, 'results': data})
+
+            if totais:
+                # Totais de todas as páginas, agregados no banco
+                if totais == 'cliente':
+                    grupos = reembolsos.values('cliente_id', nome_razao_social=F('cliente__nome_razao_social')).order_by('nome_razao_social', 'cliente_id')
+                else:
+                    grupos = reembolsos.values('ano', 'mes').order_by('ano', 'mes')
+                response.data['totais'] = list(grupos.annotate(
+                    total=Round(Coalesce(Sum('valor'), Value(0, output_field=FloatField())), 2),
+                    quantidade=Count('id'),
+                ))
+            return response
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
@@ -394,7 +598,7 @@ class ClientesFinanceiroValoresViewset(viewsets.ModelViewSet):
             if not cliente_razao_social:
                 return Response({'nome_razao_social': ['Este campo não pode ser vazio.']}, status=status.HTTP_400_BAD_REQUEST)
             
-            cliente = ClientesFinanceiro.objects.filter(nome_razao_social=cliente_razao_social).first()
+            cliente = resolver_cliente(cliente_razao_social)
             if cliente:
                 data = {
                     'mes': request.data.get('mes'),
@@ -0,0 +1,54 @@
+import hashlib
+import functools
+from django.db.models import Max, Count
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def queryset_validators(querysets):
+    # Uma consulta por queryset: MAX(updated_at) muda com inserções e alterações, COUNT(*) com exclusões
+    versions = []
+    last_modified = None
+    for queryset in querysets:
+        aggregate = queryset.order_by().aggregate(updated_at=Max('updated_at'), total=Count('pk'))
+        versions.append(f"{queryset.model._meta.db_table}:{aggregate['total']}:{aggregate['updated_at'].isoformat() if aggregate['updated_at'] else ''}")
+        if aggregate['updated_at'] and (last_modified is None or aggregate['updated_at'] > last_modified):
+            last_modified = aggregate['updated_at']
+    return versions, last_modified
+
+
+def conditional_get(querysets, vary=None):
+    """Responde 304 Not Modified sem executar nem serializar a view quando os dados não mudaram.
+
+    `querysets(self, request, *args, **kwargs)` devolve os querysets de que a
+    resposta depende. O ETag também leva a URL completa e o usuário, pois
+    filtros e página mudam o conteúdo; `vary(self, request)` acrescenta o que
+    mais influencia a resposta sem ter updated_at (ex.: grupos do usuário).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                versions, last_modified = queryset_validators(querysets(self, request, *args, **kwargs))
+                extra = [str(valor) for valor in vary(self, request)] if vary else []
+            except Exception:
+                # Sem validadores a view responde normalmente, só sem 304
+                return method(self, request, *args, **kwargs)
+            chave = '|'.join([request.get_full_path(), str(request.user.pk)] + versions + extra)
+            etag = quote_etag(hashlib.md5(chave.encode()).hexdigest())
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response['ETag'] = etag
+                if last_modified is not None:
+                    response['Last-Modified'] = http_date(last_modified)
+                # O navegador guarda a resposta, mas sempre revalida com If-None-Match
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
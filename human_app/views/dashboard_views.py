@@ -7,7 +7,19 @@ from django.db.models import Case, When, Sum, Value, FloatField, IntegerField, F
 from django.db.models.functions import Coalesce, Round
 from django_filters import rest_framework as filters
 from ..filters import IntervaloDeTempoFilter
-from human_app.models import ClientesFinanceiro, ClientesFinanceiroValores
+from human_app.models import ClientesFinanceiro, ClientesFinanceiroValores, ClientesFinanceiroFolhaPonto
+from human_app.services.clientes_resolver import resolver_cliente_id, resolver_cliente
+from .conditional import conditional_get
+
+
+def dados_dashboard(self, request, *args, **kwargs):
+    # Todas as séries do dashboard saem dos clientes e dos valores mensais
+    return [ClientesFinanceiro.objects.all(), ClientesFinanceiroValores.objects.all()]
+
+
+def dados_dashboard_folha_ponto(self, request, *args, **kwargs):
+    return dados_dashboard(self, request) + [ClientesFinanceiroFolhaPonto.objects.all()]
+
 
 
 @permission_classes([IsAuthenticated])
@@ -18,6 +30,7 @@ class DashboardViewset(viewsets.ModelViewSet):
     filterset_class = IntervaloDeTempoFilter
 
     @action(detail=False, methods=['get'], url_path='anos')
+    @conditional_get(dados_dashboard)
     def anos(self, request):
         try:
             anos = ClientesFinanceiroValores.objects.values('ano').distinct()
@@ -26,6 +39,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='clientes_financeiro')
+    @conditional_get(dados_dashboard_folha_ponto)
     def clientesFinanceiro(self, request):
         try:
             clientes_financeiro = ClientesFinanceiro.objects.all()
@@ -46,6 +60,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='provisoes_direitos_trabalhistas_3487')
+    @conditional_get(dados_dashboard)
     def provisoesDireitosTrabalhistas3487(self, request):
         try:
             has_nome_razao_social = 'nome_razao_social' in request.query_params and request.query_params['nome_razao_social'] != ''
@@ -55,7 +70,7 @@ class DashboardViewset(viewsets.ModelViewSet):
                 return Response("O cliente financeiro não foi encontrado", status=status.HTTP_404_NOT_FOUND)
             
             if has_nome_razao_social and has_ano:
-                valores = ClientesFinanceiro.objects.filter(nome_razao_social=request.query_params['nome_razao_social']).select_related('valores').annotate(
+                valores = ClientesFinanceiro.objects.filter(id=resolver_cliente_id(request.query_params['nome_razao_social'])).select_related('valores').annotate(
                     mes=Case(
                         When(valores__ano=request.query_params['ano'], then='valores__mes'),
                         output_field=IntegerField()
@@ -84,6 +99,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'], url_path='provisoes_direitos_trabalhistas_0926')
+    @conditional_get(dados_dashboard)
     def provisoesDireitosTrabalhistas0926(self, request):
         try:
             has_nome_razao_social = 'nome_razao_social' in request.query_params and request.query_params['nome_razao_social'] != ''
@@ -93,7 +109,7 @@ class DashboardViewset(viewsets.ModelViewSet):
                 return Response("O cliente financeiro não foi encontrado", status=status.HTTP_404_NOT_FOUND)
             
             if has_nome_razao_social and has_ano:
-                valores = ClientesFinanceiro.objects.filter(nome_razao_social=request.query_params['nome_razao_social']).select_related('valores').annotate(
+                valores = ClientesFinanceiro.objects.filter(id=resolver_cliente_id(request.query_params['nome_razao_social'])).select_related('valores').annotate(
                     mes=Case(
                         When(valores__ano=request.query_params['ano'], then='valores__mes'),
                         output_field=IntegerField()
@@ -122,6 +138,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'], url_path='taxa_administracao')
+    @conditional_get(dados_dashboard)
     def taxaAdministracao(self, request):
         try:
             has_nome_razao_social = 'nome_razao_social' in request.query_params and request.query_params['nome_razao_social'] != ''
@@ -133,7 +150,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             if has_nome_razao_social and has_ano:
             
                 # Selecione todas as colunas da tabela ClientesFinanceiro e faça um join com ClientesFinanceiroValores
-                taxa_adm = ClientesFinanceiro.objects.filter(nome_razao_social=request.query_params['nome_razao_social']).select_related('valores').annotate(
+                taxa_adm = ClientesFinanceiro.objects.filter(id=resolver_cliente_id(request.query_params['nome_razao_social'])).select_related('valores').annotate(
                     taxa_administracao=Coalesce(
                         Case(When(
                             valores__ano=request.query_params['ano'], then='valores__percentual_human'),
@@ -161,6 +178,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
     @action(detail=False, methods=['get'], url_path='economia_liquida')
+    @conditional_get(dados_dashboard)
     def economiaLiquida(self, request):
         try:
             economia_liquida = []
@@ -175,7 +193,7 @@ class DashboardViewset(viewsets.ModelViewSet):
 
             # Filtrar com base nos parâmetros opcionais
             if has_nome and has_ano and not has_mes:
-                cliente = ClientesFinanceiro.objects.filter(nome_razao_social=request.query_params['nome_razao_social']).first()
+                cliente = resolver_cliente(request.query_params['nome_razao_social'])
 
                 if not cliente:
                     return Response("O cliente financeiro não foi encontrado", status=status.HTTP_404_NOT_FOUND)
@@ -216,6 +234,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     @action(detail=False, methods=['get'], url_path='economia_liquida/total')
+    @conditional_get(dados_dashboard)
     def economiaLiquidaTotal(self, request):
         try:
             economia_liquida = []
@@ -266,6 +285,7 @@ class DashboardViewset(viewsets.ModelViewSet):
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=False, methods=['get'], url_path='vales_sst')
+    @conditional_get(dados_dashboard)
     def vales_sst(self, request):
         try:
             vales_sst = self.filter_queryset(self.get_queryset())
@@ -3,64 +3,81 @@ from rest_framework.views import Response
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from human_app.models import User, Funcionarios
-from ..serializers import FuncionariosSerializer, UserSerializer
+from human_app.services.permissions import get_user_groups, invalidate_user_groups
+from human_app.services.user_cache import invalidate_users
+from .multi_status import multi_status_response
+from human_app.pagination import KeysetPagination, usar_cursor
+from rest_framework.exceptions import ValidationError
+from ..serializers import FuncionariosSerializer, FuncionariosProjecaoSerializer, UserSerializer, funcionarios_projecao
 
 @permission_classes([IsAuthenticated])
 class FuncionarioViewset(viewsets.ModelViewSet):
     queryset = Funcionarios.objects.all()    
     serializer_class = FuncionariosSerializer
+    max_page_size = 500
     
     def retrieve(self, request, pk=None):
         try:
-            user = Funcionarios.objects.get(user=pk)
-            serializer = FuncionariosSerializer(user)
+            user = funcionarios_projecao().get(user=pk)
+            serializer = FuncionariosProjecaoSerializer(user)
             if serializer:
                 user_data = serializer.data
-                groups = [group.name for group in Group.objects.filter(user=user.user.id).all()]
+                groups = sorted(get_user_groups(user.user_id))
                 user_data['groups'] = groups
-                del user_data['user_permissions']
                 return Response(user_data, status=status.HTTP_200_OK)
         except Funcionarios.DoesNotExist:
             return Response({'error': 'Funcionário não encontrado'}, status=status.HTTP_404_NOT_FOUND)
     
+    def listar_funcionarios(self, request, is_active):
+        # Uma consulta para funcionários + usuários (só as colunas exibidas) e uma para os grupos.
+        # Filtros opcionais: ?situacao=ATIVO,FERIAS e ?group=RH_OPERACAO (pode repetir).
+        # Paginação por cursor opcional, a mesma das demais listas: ?paginacao=cursor&limit=50
+        # (ou ?limit=50) e depois o link 'next' da resposta.
+        funcionarios = funcionarios_projecao(Funcionarios.objects.filter(user__is_active=is_active)) \
+            .prefetch_related(Prefetch('user__groups', queryset=Group.objects.only('id', 'name'))) \
+            .order_by('user_id')
+
+        situacao = request.query_params.get('situacao')
+        if situacao:
+            funcionarios = funcionarios.filter(situacao__in=situacao.split(','))
+        groups = request.query_params.getlist('group')
+        if groups:
+            funcionarios = funcionarios.filter(user__groups__name__in=groups).distinct()
+
+        paginator = None
+        if usar_cursor(request) or 'limit' in request.query_params:
+            paginator = KeysetPagination(ordering=('user_id', 'id'))
+            paginator.max_page_size = self.max_page_size
+            funcionarios = paginator.paginate_queryset(funcionarios, request, view=self)
+        else:
+            funcionarios = list(funcionarios)
+
+        serializer = FuncionariosProjecaoSerializer(funcionarios, many=True)
+        funcionarios_data = serializer.data
+        for funcionario, funcionario_data in zip(funcionarios, funcionarios_data):
+            funcionario_data['groups'] = [group.name for group in funcionario.user.groups.all()]
+
+        if paginator is None:
+            return Response(funcionarios_data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(funcionarios_data)
+
     @action(detail=False, methods=['get'], url_path='buscar_usuarios_ativos')
     def buscar_usuarios_ativos(self, request, *args, **kwargs):
         try:
-            funcionarios = Funcionarios.objects.filter(user__is_active=True)
-            serializer = FuncionariosSerializer(funcionarios, many=True)
-            if serializer:
-                funcionarios_data = serializer.data
-                index = 0
-                for funcionario in funcionarios_data:
-                    groups = [group.name for group in Group.objects.filter(user=funcionario.get('id')).all()]
-                    funcionario['situacao'] = funcionarios.get(id=funcionario.get('id')).situacao
-                    funcionario['groups'] = groups
-                    del funcionario['user_permissions']
-                    funcionarios_data[index] = funcionario
-                    index += 1
-                return Response(funcionarios_data, status=status.HTTP_200_OK)
-        except Funcionarios.DoesNotExist:
-            return Response({'error': 'Funcionários não encontrado'}, status=status.HTTP_404_NOT_FOUND)
-    
+            return self.listar_funcionarios(request, is_active=True)
+        except ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
+
     @action(detail=False, methods=['get'], url_path='buscar_usuarios_inativos')
     def buscar_usuarios_inativos(self, request, *args, **kwargs):
         try:
-            funcionarios = Funcionarios.objects.filter(user__is_active=False)
-            serializer = FuncionariosSerializer(funcionarios, many=True)
-            if serializer:
-                funcionarios_data = serializer.data
-                index = 0
-                for funcionario in funcionarios_data:
-                    groups = [group.name for group in Group.objects.filter(user=funcionario.get('id')).all()]
-                    funcionario['situacao'] = funcionarios.get(id=funcionario.get('id')).situacao
-                    funcionario['groups'] = groups
-                    del funcionario['user_permissions']
-                    funcionarios_data[index] = funcionario
-                    index += 1
-                return Response(funcionarios_data, status=status.HTTP_200_OK)
-        except Funcionarios.DoesNotExist:
-            return Response({'error': 'Funcionários não encontrado'}, status=status.HTTP_404_NOT_FOUND)
+            return self.listar_funcionarios(request, is_active=False)
+        except ValidationError as error:
+            return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['put'], url_path='activate')
     def activate_user(self, request, pk=None):
@@ -72,7 +89,7 @@ class FuncionarioViewset(viewsets.ModelViewSet):
                 group = Group.objects.get(id=id)
                 user.groups.add(group)
                 user.is_active = True
-                Funcionarios.objects.filter(user=user).update(situacao='ATIVO')
+                Funcionarios.objects.filter(user=user).update(situacao='ATIVO', updated_at=timezone.now())
                 if group.name == 'ADMIN':
                     user.is_staff = True
                 user.save()
@@ -85,11 +102,121 @@ class FuncionarioViewset(viewsets.ModelViewSet):
         try:
             user = User.objects.filter(id=pk).get()
             user.is_active = False
-            Funcionarios.objects.filter(user=user).update(situacao='INATIVO')
+            Funcionarios.objects.filter(user=user).update(situacao='INATIVO', updated_at=timezone.now())
             user.save()
             return Response(f"O usuário {user.username} foi desativado com sucesso", status=status.HTTP_204_NO_CONTENT)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def ids_lote(self, request):
+        ids = request.data.get('ids')
+        if not ids or not isinstance(ids, list):
+            raise ValueError("O campo 'ids' é obrigatório")
+        return [int(id) for id in ids]
+
+    def resultados_lote(self, ids, encontrados, mensagem):
+        results = []
+        for id in ids:
+            if id in encontrados:
+                results.append({"status": "success", "code": 200, "id": id, "data": mensagem.format(username=encontrados[id])})
+            else:
+                results.append({"status": "error", "code": 404, "id": id, "error": "Usuário não encontrado"})
+        return results
+
+    def adicionar_grupos_lote(self, user_ids, group_ids, substituir=False):
+        # Insere só os vínculos usuário-grupo que ainda não existem, em uma única instrução
+        UserGroups = User.groups.through
+        if substituir:
+            UserGroups.objects.filter(user_id__in=user_ids).exclude(group_id__in=group_ids).delete()
+        existentes = set(UserGroups.objects.filter(user_id__in=user_ids, group_id__in=group_ids).values_list('user_id', 'group_id'))
+        UserGroups.objects.bulk_create([
+            UserGroups(user_id=user_id, group_id=group_id)
+            for user_id in user_ids for group_id in group_ids
+            if (user_id, group_id) not in existentes
+        ], ignore_conflicts=True)
+
+    def grupos_lote(self, request):
+        group_ids = [int(id) for id in request.data.get('groups') or []]
+        groups = dict(Group.objects.filter(id__in=group_ids).values_list('id', 'name'))
+        faltando = set(group_ids) - set(groups)
+        if faltando:
+            raise ValueError(f"Grupos não encontrados: {', '.join(str(id) for id in sorted(faltando))}")
+        return groups
+
+    def invalidar_caches(self, user_ids):
+        # update() e bulk_create() não disparam signals, então os caches são limpos aqui
+        invalidate_users(*user_ids)
+        invalidate_user_groups(*user_ids)
+
+    @action(detail=False, methods=['put'], url_path='activate/lote')
+    def activate_users(self, request):
+        try:
+            ids = self.ids_lote(request)
+            groups = self.grupos_lote(request)
+            if not groups:
+                return Response({"error": "O campo 'groups' é obrigatório"}, status=status.HTTP_400_BAD_REQUEST)
+        except (ValueError, TypeError) as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                encontrados = dict(User.objects.filter(id__in=ids).values_list('id', 'username'))
+                user_ids = list(encontrados)
+                if user_ids:
+                    self.adicionar_grupos_lote(user_ids, list(groups))
+                    user_data = {'is_active': True}
+                    if 'ADMIN' in groups.values():
+                        user_data['is_staff'] = True
+                    User.objects.filter(id__in=user_ids).update(**user_data)
+                    Funcionarios.objects.filter(user_id__in=user_ids).update(situacao='ATIVO', updated_at=timezone.now())
+            self.invalidar_caches(user_ids)
+            return multi_status_response(self.resultados_lote(ids, encontrados, "O usuário {username} foi ativado com sucesso"))
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['put'], url_path='deactivate/lote')
+    def desactivate_users(self, request):
+        try:
+            ids = self.ids_lote(request)
+        except (ValueError, TypeError) as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                encontrados = dict(User.objects.filter(id__in=ids).values_list('id', 'username'))
+                user_ids = list(encontrados)
+                if user_ids:
+                    User.objects.filter(id__in=user_ids).update(is_active=False)
+                    Funcionarios.objects.filter(user_id__in=user_ids).update(situacao='INATIVO', updated_at=timezone.now())
+            self.invalidar_caches(user_ids)
+            return multi_status_response(self.resultados_lote(ids, encontrados, "O usuário {username} foi desativado com sucesso"))
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['put'], url_path='groups/lote')
+    def update_groups(self, request):
+        # {"ids": [...], "groups": [...], "substituir": true} troca os grupos; sem "substituir" apenas adiciona
+        try:
+            ids = self.ids_lote(request)
+            groups = self.grupos_lote(request)
+        except (ValueError, TypeError) as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            substituir = bool(request.data.get('substituir', False))
+            with transaction.atomic():
+                encontrados = dict(User.objects.filter(id__in=ids).values_list('id', 'username'))
+                user_ids = list(encontrados)
+                if user_ids:
+                    self.adicionar_grupos_lote(user_ids, list(groups), substituir)
+                    if substituir:
+                        # Recalcula is_staff pelos grupos finais: quem saiu do ADMIN deixa de ser staff
+                        admins = User.groups.through.objects.filter(user_id__in=user_ids, group__name='ADMIN').values('user_id')
+                        User.objects.filter(id__in=admins).update(is_staff=True)
+                        User.objects.filter(id__in=user_ids, is_superuser=False).exclude(id__in=admins).update(is_staff=False)
+                    elif 'ADMIN' in groups.values():
+                        User.objects.filter(id__in=user_ids).update(is_staff=True)
+            self.invalidar_caches(user_ids)
+            return multi_status_response(self.resultados_lote(ids, encontrados, "Os grupos do usuário {username} foram atualizados com sucesso"))
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
     def partial_update(self, request, *args, **kwargs):
         try:
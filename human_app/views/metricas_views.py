@@ -0,0 +1,22 @@
+from rest_framework import status
+from rest_framework.views import APIView, Response
+from rest_framework.permissions import IsAdminUser
+from human_app.services.user_cache import user_cache_stats
+from human_app.services.permissions import groups_cache
+from human_project.mysql_pool.pool import pool_stats
+
+
+class Metricas(APIView):
+    # Métricas dos caches em memória e do pool de conexões deste processo, só para staff
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            metricas = {
+                'user_cache': user_cache_stats(),
+                'groups_cache': groups_cache.stats(),
+                'db_pool': pool_stats(),
+            }
+            return Response(metricas, status=status.HTTP_200_OK)
+        except Exception as error:
+            return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,19 @@
+from rest_framework import status
+from rest_framework.views import Response
+
+
+def multi_status_response(results):
+    # Mesmo formato do create_folhas_ponto: 200 se tudo deu certo, 400 se tudo falhou e 207 se misturado
+    if not results:
+        return Response({"error": "Nenhum registro foi encontrado"}, status=status.HTTP_404_NOT_FOUND)
+
+    success = sum(1 for result in results if result['status'] == 'success')
+    errors = len(results) - success
+
+    if errors > 0 and success > 0:
+        return Response(results, status=status.HTTP_207_MULTI_STATUS)
+
+    if errors > 0 and success == 0:
+        return Response(results, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(results, status=status.HTTP_200_OK)
@@ -3,45 +3,44 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from human_app.models import Robos, RobosParametros, Parametros
+from human_app.services.permissions import get_categorias_permitidas, get_request_groups, get_robos_categorias
 from ..serializers.robos_serial import *
+from .conditional import conditional_get
 import subprocess
 from datetime import datetime
 from time import sleep
 import requests
 import json
 
+def dados_robos(self, request, *args, **kwargs):
+    return [Robos.objects.all()]
+
+
+def grupos_usuario(self, request):
+    # A lista depende das categorias permitidas aos grupos do usuário
+    return sorted(get_request_groups(request))
+
+
 @permission_classes([IsAuthenticated])
 class RobosViewset(viewsets.ModelViewSet):
     queryset = Robos.objects.all()    
     serializer_class = RobosSerializer
 
     @action(detail=False, methods=['get'], url_path='categorias')
+    @conditional_get(dados_robos)
     def categorias(self, request):
         try:
-            categorias = Robos.objects.values_list('categoria', flat=True).distinct()
+            # Ordem estável para o ETag e para o front; categoria pode ser nula
+            categorias = sorted(get_robos_categorias(), key=lambda categoria: categoria or '')
             return Response(categorias, status=status.HTTP_200_OK)
         except Exception as error:
             return Response(f"{error}", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @conditional_get(dados_robos, vary=grupos_usuario)
     def list(self, request):
         try:
-            user_groups = {group.name for group in request.user.groups.all()}  # Use um set para otimizar a busca por grupos
-            categorias_permitidas = set()  # Conjunto para armazenar categorias permitidas
-
-            if "ADMIN" in user_groups or "TI" in user_groups:
-                # Se o usuário for "ADMIN" ou "TI", checar se a categoria foi informada
-                has_categoria = 'categoria' in request.query_params and request.query_params['categoria'] != ''
-
-                if has_categoria: # Se a categoria foi informada, adicionar a categoria ao conjunto de categorias permitidas
-                    categorias_permitidas.add(request.query_params['categoria'])
-                else: # Se a categoria não foi informada, permitir acesso a todas as categorias
-                    categorias_permitidas.update(Robos.objects.values_list('categoria', flat=True).distinct())
-            # Se o usuário for "RH_OPERACAO", permitir acesso à categoria "RH"
-            if "RH_OPERACAO" in user_groups or "RH_GERENCIA" in user_groups:
-                categorias_permitidas.add("RH")
-            # Se o usuário for "FINANCEIRO_OPERACAO", permitir acesso à categoria "FINANCEIRO"
-            if "FINANCEIRO_OPERACAO" in user_groups:
-                categorias_permitidas.add("FINANCEIRO")
+            # Grupos vêm do token (ou do cache) e as categorias de robôs do cache de permissões
+            categorias_permitidas = get_categorias_permitidas(get_request_groups(request), request.query_params.get('categoria'))
 
             # Se não houver categorias permitidas, proibir o acesso
             if not categorias_permitidas:
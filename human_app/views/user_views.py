@@ -8,22 +8,53 @@ from django.utils.crypto import get_random_string
 from django.conf import settings
 from aws_parameters import get_ssm_parameter
 from human_app.models import User, Funcionarios, PasswordResetTokens
-from ..serializers import UserSerializer, FuncionariosSerializer, GroupSerializer, PasswordResetTokenSerializer
+from human_app.services.permissions import get_user_groups
+from human_app.services.token_claims import profile_from_token
+from human_app.services.password_reset import enforce_user_token_cap
+from human_app.services.importacao_funcionarios import ler_arquivo, importar_funcionarios
+from .multi_status import multi_status_response
+import csv
+from ..serializers import UserSerializer, UserProjecaoSerializer, user_projecao, FuncionariosSerializer, FuncionariosProjecaoSerializer, GroupSerializer, PasswordResetTokenSerializer, funcionarios_projecao
 
 class UserViewset(viewsets.ModelViewSet):
     queryset = User.objects.all()    
     serializer_class = UserSerializer
 
+    # Leituras pela projeção: colunas usadas e M2Ms em prefetch, sem N+1
+    def list(self, request, *args, **kwargs):
+        try:
+            queryset = self.filter_queryset(user_projecao().order_by('id'))
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = UserProjecaoSerializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            serializer = UserProjecaoSerializer(queryset, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except Exception as error:
+            return Response({'error': str(error)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def retrieve(self, request, pk=None):
+        try:
+            user = user_projecao().get(pk=pk)
+            return Response(UserProjecaoSerializer(user).data, status=status.HTTP_200_OK)
+        except (User.DoesNotExist, ValueError):
+            return Response({'error': 'Usuário não encontrado'}, status=status.HTTP_404_NOT_FOUND)
+
     @action(detail=False, methods=['get'], url_path='login')
     def login(self, request, *args, **kwargs):
         try:
-            user = Funcionarios.objects.get(user=request.user)
-            serializer = FuncionariosSerializer(user)
+            # O perfil básico vem das claims do token; ?completo=true força a leitura do banco
+            if request.query_params.get('completo') != 'true':
+                profile = profile_from_token(request.auth)
+                if profile:
+                    return Response(profile, status=status.HTTP_200_OK)
+
+            user = funcionarios_projecao().get(user=request.user)
+            serializer = FuncionariosProjecaoSerializer(user)
             if serializer:
                 user_data = serializer.data
-                groups = [group.name for group in Group.objects.filter(user=request.user).all()]
+                groups = sorted(get_user_groups(request.user.id))
                 user_data['groups'] = groups
-                del user_data['user_permissions']
                 return Response(user_data, status=status.HTTP_200_OK)
         except Exception as error:
             return Response({'error': str(error)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -55,6 +86,26 @@ class UserViewset(viewsets.ModelViewSet):
         except Exception as error:
             return Response({'error': str(error)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'], url_path='importar', permission_classes=[IsAuthenticated])
+    def importar(self, request):
+        # Recebe um arquivo CSV/JSON no campo 'arquivo' ou uma lista JSON no corpo
+        try:
+            arquivo = request.FILES.get('arquivo')
+            if arquivo:
+                linhas = ler_arquivo(arquivo.read(), arquivo.name)
+            else:
+                linhas = request.data if isinstance(request.data, list) else request.data.get('funcionarios')
+                if linhas and not isinstance(linhas, list):
+                    raise ValueError('esperada uma lista de funcionários')
+            if not linhas:
+                return Response({'error': 'Nenhum funcionário informado.'}, status=status.HTTP_400_BAD_REQUEST)
+        except (ValueError, UnicodeDecodeError, csv.Error) as error:
+            return Response({'error': f'Arquivo inválido: {error}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return multi_status_response(importar_funcionarios(linhas))
+        except Exception as error:
+            return Response({'error': str(error)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
     @action(detail=False, methods=['post'], url_path='forgot_password')
     def forgot_password(self, request):
         email = request.data.get('email')
@@ -66,6 +117,9 @@ class UserViewset(viewsets.ModelViewSet):
         except User.DoesNotExist:
             return Response('Usuário não encontrado.', status=status.HTTP_404_NOT_FOUND)
         
+        # Limita os tokens pendentes do usuário para a tabela não crescer a cada pedido
+        enforce_user_token_cap(user)
+
         token = get_random_string(length=32)
         token_data = {
             'user': user.pk,
@@ -0,0 +1,111 @@
+import sys
+import json
+import queue
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Atributos padrão de LogRecord; o que sobrar veio de `extra=` e vai para o JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON."""
+
+    def format(self, record):
+        data = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Deixa passar só uma fração dos registros de cada logger.
+
+    `rates` mapeia nome de logger (ou prefixo) para a fração mantida, por
+    exemplo {'django.db.backends': 0.01}. WARNING ou acima nunca é amostrado.
+    """
+
+    def __init__(self, rates=None, default_rate=1.0):
+        super().__init__()
+        self.rates = rates or {}
+        self.default_rate = default_rate
+
+    def _rate(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return self.default_rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Handler que só enfileira o registro; a escrita é feita por uma thread.
+
+    O arquivo e o console são escritos por um QueueListener em segundo plano,
+    então a thread da requisição nunca bloqueia em I/O. Com a fila cheia o
+    registro é descartado e contado em `dropped` em vez de travar a requisição.
+    """
+
+    def __init__(self, filename=None, console=True, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.dropped = 0
+        self.targets = []
+        if filename:
+            self.targets.append(logging.FileHandler(filename, encoding='utf-8', delay=True))
+        if console:
+            self.targets.append(logging.StreamHandler(sys.stderr))
+        self.listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+        self._stopped = False
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        for handler in self.targets:
+            handler.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Resolve mensagem e traceback aqui, pois args/exc_info podem não ser serializáveis
+        # ou mudar até a thread de escrita processar o registro
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # logging.shutdown() chama close() na saída do processo, esvaziando a fila antes
+        if not self._stopped:
+            self._stopped = True
+            self.listener.stop()
+            for handler in self.targets:
+                handler.close()
+        super().close()
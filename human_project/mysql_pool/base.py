@@ -0,0 +1,33 @@
+from functools import partial
+from django.db.backends.mysql import base
+from .pool import get_pool
+
+# Valores padrão do pool, sobrescritos por DATABASES[alias]['POOL']
+POOL_DEFAULTS = {
+    'min_size': 1,
+    'max_size': 10,
+    'max_idle': 300,
+    'max_lifetime': 3600,
+    'timeout': 10,
+    'health_check_interval': 30,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Backend MySQL do Django que pega as conexões de um pool do processo.
+
+    Com CONN_MAX_AGE = 0 o Django continua "fechando" a conexão ao fim de cada
+    requisição, mas o fechamento apenas devolve a conexão ao pool, então o
+    handshake com o banco só acontece quando o pool precisa crescer.
+    """
+
+    def get_new_connection(self, conn_params):
+        options = {**POOL_DEFAULTS, **self.settings_dict.get('POOL', {})}
+        # Guarda o pool da conexão para devolvê-la ao mesmo pool no _close
+        self._pool = get_pool(self.alias, conn_params, partial(super().get_new_connection, conn_params), options)
+        return self._pool.checkout()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool.checkin(self.connection, discard=self.errors_occurred)
@@ -0,0 +1,219 @@
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger('django.db.backends')
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Pool de conexões MySQL compartilhado pelas threads de um processo.
+
+    As conexões ociosas ficam numa pilha (LIFO), então as mais usadas
+    continuam quentes e as sobrando expiram por ociosidade. Antes de reusar
+    uma conexão parada há mais de `health_check_interval` segundos é feito um
+    ping; conexões que falham no ping ou passaram de `max_lifetime` são
+    descartadas e contadas como `stale_drops`.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, max_idle=300, max_lifetime=3600,
+                 timeout=10, health_check_interval=30):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conexão, criada_em, usada_em)
+        self._created_at = {}
+        self._size = 0
+        self._metrics = {
+            'checkouts': 0,
+            'checkins': 0,
+            'created': 0,
+            'waits': 0,
+            'wait_timeouts': 0,
+            'stale_drops': 0,
+            'idle_evictions': 0,
+            'discarded': 0,
+        }
+
+    def checkout(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                self._evict_idle()
+                while self._idle:
+                    connection, created_at, used_at = self._idle.pop()
+                    if self._is_healthy(connection, created_at, used_at):
+                        self._metrics['checkouts'] += 1
+                        return connection
+                    self._metrics['stale_drops'] += 1
+                    self._destroy(connection)
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                # Conta um checkout que esperou, não cada volta do laço
+                if not waited:
+                    waited = True
+                    self._metrics['waits'] += 1
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._size >= self.max_size:
+                        self._metrics['wait_timeouts'] += 1
+                        raise PoolTimeout(f"Nenhuma conexão disponível no pool após {self.timeout}s")
+        return self._open()
+
+    def checkin(self, connection, discard=False):
+        if not discard:
+            discard = not self._reset(connection)
+        with self._cond:
+            if discard or connection not in self._created_at:
+                self._metrics['discarded'] += 1
+                self._destroy(connection)
+            else:
+                self._metrics['checkins'] += 1
+                self._idle.append((connection, self._created_at[connection], time.monotonic()))
+            self._cond.notify()
+
+    def warm(self):
+        # Abre conexões até o tamanho mínimo sem ultrapassar o máximo
+        while True:
+            with self._cond:
+                if self._size >= self.min_size or self._size >= self.max_size:
+                    return
+                self._size += 1
+            try:
+                connection = self._open(count_checkout=False)
+            except Exception as error:
+                logger.warning("Falha ao pré-abrir conexão do pool: %s", error)
+                return
+            self.checkin(connection)
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                connection, _, _ = self._idle.pop()
+                self._destroy(connection)
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._metrics,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            }
+
+    def _open(self, count_checkout=True):
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_at[connection] = time.monotonic()
+            self._metrics['created'] += 1
+            if count_checkout:
+                self._metrics['checkouts'] += 1
+        return connection
+
+    def _is_healthy(self, connection, created_at, used_at):
+        now = time.monotonic()
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return False
+        if now - used_at < self.health_check_interval:
+            return True
+        try:
+            connection.ping()
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, connection):
+        # Uma conexão devolvida no meio de uma transação não pode ir para outra requisição
+        try:
+            if not connection.get_autocommit():
+                connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle(self):
+        if not self.max_idle:
+            return
+        now = time.monotonic()
+        kept = deque()
+        # As mais antigas ficam no início da fila
+        while self._idle:
+            item = self._idle.popleft()
+            if now - item[2] > self.max_idle and self._size > self.min_size:
+                self._metrics['idle_evictions'] += 1
+                self._destroy(item[0])
+            else:
+                kept.append(item)
+        self._idle = kept
+
+    def _destroy(self, connection):
+        self._created_at.pop(connection, None)
+        self._size -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _freeze(value):
+    # Transforma os parâmetros de conexão (dicts e listas aninhados) em uma chave imutável
+    if isinstance(value, dict):
+        return tuple(sorted(((str(key), _freeze(item)) for key, item in value.items()), key=lambda par: par[0]))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def get_pool(alias, conn_params, connect, options):
+    """Retorna o pool do alias para estes parâmetros de conexão, criando-o se preciso.
+
+    O pool é separado por alias e parâmetros, então uma mudança de
+    DATABASES (outro host, usuário ou banco) não reaproveita conexões antigas.
+    """
+    key = (alias, _freeze(conn_params))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(connect, **options)
+            _pools[key] = pool
+            if pool.min_size:
+                threading.Thread(target=pool.warm, name=f'mysql-pool-warm-{alias}', daemon=True).start()
+        return pool
+
+
+def pool_stats():
+    # Um item por pool: alias@host/banco
+    with _pools_lock:
+        stats = {}
+        for (alias, frozen_params), pool in _pools.items():
+            params = dict(frozen_params)
+            label = f"{alias}@{params.get('host', '')}/{params.get('database') or params.get('db', '')}"
+            stats[label] = pool.stats()
+        return stats
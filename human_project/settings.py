@@ -10,10 +10,14 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
-from aws_parameters import get_ssm_parameter
+from aws_parameters import get_ssm_parameter, load_parameters
 from pathlib import Path
 from datetime import timedelta
 
+# Carrega todos os parâmetros '/human/' em uma única chamada (com cache em disco);
+# os get_ssm_parameter abaixo são atendidos pelo cache do processo.
+load_parameters()
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -82,12 +86,22 @@ WSGI_APPLICATION = 'human_project.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        # Backend MySQL com pool de conexões (human_project/mysql_pool)
+        'ENGINE': 'human_project.mysql_pool',
         'NAME': get_ssm_parameter('/human/DB_NAME'),
         'USER': get_ssm_parameter('/human/DB_USER'),
         'PASSWORD': get_ssm_parameter('/human/DB_PASSWORD'),
         'HOST': get_ssm_parameter('/human/DB_HOST'),
         'PORT': get_ssm_parameter('/human/DB_PORT', '3306'),
+        # O pool reaproveita as conexões; o Django devolve a conexão a cada requisição
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'min_size': int(get_ssm_parameter('/human/DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(get_ssm_parameter('/human/DB_POOL_MAX_SIZE', '10')),
+            'max_idle': int(get_ssm_parameter('/human/DB_POOL_MAX_IDLE', '300')),
+            'max_lifetime': int(get_ssm_parameter('/human/DB_POOL_MAX_LIFETIME', '3600')),
+            'timeout': int(get_ssm_parameter('/human/DB_POOL_TIMEOUT', '10')),
+        },
     }
 }
 
@@ -200,6 +214,17 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_SAMESITE': 'Lax',  # Protege contra CSRF
 }
 
+# Tempo (s) que o usuário resolvido a partir do token fica em cache no processo
+AUTH_USER_CACHE_TTL = 60
+
+# Tempo (s) que o id resolvido a partir de razão social/CNPJ/CPF fica em cache no processo
+CLIENTES_RESOLVER_CACHE_TTL = 300
+
+# Intervalo (s) de sincronização da lista de tokens revogados (tabela revoked_tokens)
+REVOKED_TOKENS_SYNC_INTERVAL = 30
+# Janela (s) relida a cada sincronização para pegar revogações com commit atrasado
+REVOKED_TOKENS_SYNC_OVERLAP = 60
+
 # Configuração de email
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -209,25 +234,63 @@ EMAIL_USER = get_ssm_parameter('/human/EMAIL_USER')
 EMAIL_PASSWORD = get_ssm_parameter('/human/EMAIL_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_USER
 
+# Tokens de redefinição de senha
+PASSWORD_RESET_MAX_TOKENS_PER_USER = 3
+# Intervalo (s) da limpeza em segundo plano dos tokens expirados; None desativa
+# (use o comando purge_password_reset_tokens via cron)
+PASSWORD_RESET_PURGE_INTERVAL = None
+PASSWORD_RESET_PURGE_BATCH_SIZE = 1000
+
+# Importação de funcionários em lote: processos usados para calcular os hashes das senhas
+# (None = número de CPUs) e tamanho mínimo do lote para usar o pool
+IMPORTACAO_HASH_WORKERS = None
+IMPORTACAO_MIN_HASH_PARALELO = 8
+
+# Logging assíncrono: os handlers só enfileiram; uma thread grava em disco/console
+LOG_LEVEL = get_ssm_parameter('/human/LOG_LEVEL', 'INFO')
+LOG_SQL_LEVEL = get_ssm_parameter('/human/LOG_SQL_LEVEL', 'WARNING')
+LOG_SQL_SAMPLE_RATE = float(get_ssm_parameter('/human/LOG_SQL_SAMPLE_RATE', '0.01'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'human_project.log_handlers.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sampling': {
+            '()': 'human_project.log_handlers.SamplingFilter',
+            'rates': {
+                'django.db.backends': LOG_SQL_SAMPLE_RATE,
+            },
+        },
+    },
     'handlers': {
-        'file': {
+        'async': {
             'level': 'DEBUG',
-            'class': 'logging.FileHandler',
+            'class': 'human_project.log_handlers.AsyncQueueHandler',
             'filename': '/var/log/django/debug.log',
-        },
-        'console': {
-            'level': 'DEBUG',
-            'class': 'logging.StreamHandler',
+            'console': True,
+            'queue_size': 10000,
+            'formatter': 'json',
+            'filters': ['sampling'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
-            'level': 'DEBUG',
+            'handlers': ['async'],
+            'level': LOG_LEVEL,
             'propagate': True,
         },
+        'django.db.backends': {
+            'level': LOG_SQL_LEVEL,
+        },
+        'human_app': {
+            'handlers': ['async'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
     },
 }
@@ -17,7 +17,6 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 from human_app.views import *
 
 
@@ -38,9 +37,13 @@ urlpatterns = [
 
     # Autenticação
     path('api/check_user', CheckUser.as_view(), name='check_user'),
+    path('api/session/login/', SessionLogin.as_view(), name='session_login'),
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('api/session/renew/', SessionRenewToken.as_view(), name='session_renew_token'),
     path('api/session/verify/', SessionVerifyToken.as_view(), name='session_verify_token'),
     path('api/session/logout/', SessionLogout.as_view(), name='session_logout'),
+
+    # Métricas dos caches e do pool (staff)
+    path('api/metricas/', Metricas.as_view(), name='metricas'),
 ]
@@ -0,0 +1 @@
+SELECT id FROM clientes_financeiro WHERE {campo} = %s ORDER BY id LIMIT 1